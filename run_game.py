@@ -0,0 +1,4 @@
+"""Start Zombie Knight, the same as python -m zombie_knight (PyInstaller builds use this script)"""
+import runpy
+
+runpy.run_module("zombie_knight", run_name="__main__", alter_sys=True)
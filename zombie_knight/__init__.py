@@ -0,0 +1,6 @@
+"""Zombie Knight, a platformer where a knight survives nights of zombies
+
+Importing the package (or any module in it) has no side effects: no
+window opens and no assets load until main() or the classes ask for
+them. Run the game with python -m zombie_knight.
+"""
@@ -0,0 +1,7 @@
+"""Run the game with python -m zombie_knight"""
+import time
+
+import_start = time.perf_counter()
+from zombie_knight.main import main
+
+main(import_time=time.perf_counter() - import_start)
@@ -0,0 +1,91 @@
+"""Swept collision tests
+
+Instead of checking for overlap after a move (and stepping a pixel at a
+time until it goes away), these functions look at the whole path a box
+travelled this frame and work out when it first touched a platform.
+Fast objects can't skip over a platform or a zombie between frames.
+"""
+from operator import attrgetter
+
+get_rect = attrgetter("rect")
+
+
+def get_hitbox_insets(images):
+    """Get how many transparent columns the narrowest frame of an animation leaves on its left and right"""
+    left_inset = right_inset = None
+    for image in images:
+        bounds = image.get_bounding_rect()
+        if bounds.width == 0:
+            continue
+        left = bounds.left
+        right = image.get_width() - bounds.right
+        left_inset = left if left_inset is None else min(left_inset, left)
+        right_inset = right if right_inset is None else min(right_inset, right)
+    return left_inset or 0, right_inset or 0
+
+
+def horizontal_span(previous_rect, rect, time, insets):
+    """Get the left and right of a box part way through its move (teleports and wrap arounds don't slide)"""
+    dx = rect.x - previous_rect.x
+    if abs(dx) > rect.width:
+        dx = 0
+        previous_rect = rect
+    left = previous_rect.left + insets[0] + dx * time
+    right = previous_rect.right - insets[1] + dx * time
+    return left, right
+
+
+def sweep_landing(previous_rect, rect, platform_group, rest_depth, insets=(0, 0)):
+    """Get the first platform a falling box reaches this frame, or None
+
+    A box has landed when its bottom crosses rest_depth pixels below the
+    top of a platform. insets trims transparent columns off the sides of
+    the box so only the visible body can land.
+    """
+    dy = rect.bottom - previous_rect.bottom
+    if dy <= 0:
+        return None
+
+    # Broad phase: only the platforms inside the area swept this frame
+    swept_rect = previous_rect.union(rect)
+    swept_rect.height += rest_depth
+    candidates = swept_rect.collideobjectsall(platform_group.sprites(), key=get_rect)
+
+    # Narrow phase: time of impact with each candidate's resting line
+    landing_platform = None
+    landing_time = 2
+    for platform in candidates:
+        line = platform.rect.top + rest_depth
+        if previous_rect.bottom <= line <= rect.bottom:
+            time = (line - previous_rect.bottom) / dy
+            left, right = horizontal_span(previous_rect, rect, time, insets)
+            if time < landing_time and left < platform.rect.right and right > platform.rect.left:
+                landing_platform = platform
+                landing_time = time
+    return landing_platform
+
+
+def sweep_ceiling(previous_rect, rect, platform_group, insets=(0, 0)):
+    """Get the first platform a rising box hits its head on this frame, or None"""
+    dy = rect.top - previous_rect.top
+    if dy >= 0:
+        return None
+
+    candidates = previous_rect.union(rect).collideobjectsall(platform_group.sprites(), key=get_rect)
+
+    ceiling_platform = None
+    ceiling_time = 2
+    for platform in candidates:
+        line = platform.rect.bottom
+        if rect.top < line <= previous_rect.top:
+            time = (previous_rect.top - line) / -dy
+            left, right = horizontal_span(previous_rect, rect, time, insets)
+            if time < ceiling_time and left < platform.rect.right and right > platform.rect.left:
+                ceiling_platform = platform
+                ceiling_time = time
+    return ceiling_platform
+
+
+def collide_swept(sprite, other):
+    """Collision callback for spritecollide/groupcollide that tests the area a sprite swept this frame"""
+    return sprite.swept_rect.colliderect(other.rect)
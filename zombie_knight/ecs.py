@@ -0,0 +1,563 @@
+"""Entity components and the systems that update every entity having a component in one loop
+
+Sprites are the entities. Each one is built from components (where it is,
+how it moves, how it animates, ...) and, while it belongs to an
+EntityGroup, the level's EntitySystems keeps every component of a kind in
+one list with no gaps. Each frame a system walks one of those lists, so a
+new kind of entity only needs the right components, not its own update
+method.
+
+An entity with a Sleeper that stops on a platform goes to sleep: its
+movement, collision and portal components are disabled until something
+wakes it (the player touching it, a timer, or the platforms around it
+being rebuilt).
+
+Entities are also filed under the chunk their bottomleft is in, so marking
+which are active and drawing them only visits the chunks around the
+loaded area or the camera instead of every entity in the world.
+"""
+import pygame
+
+from zombie_knight import settings, telemetry
+from zombie_knight.collision import sweep_ceiling, sweep_landing
+
+#Use 2D vectors
+vector = pygame.math.Vector2
+
+COMPONENT_NAMES = ("transform", "velocity", "gravity", "animation", "collider", "traveller", "chaser", "projectile", "sleeper")
+
+#Components a sleeping entity skips
+SLEEP_COMPONENT_NAMES = ("velocity", "gravity", "collider", "traveller", "sleeper")
+
+
+class Transform():
+    """Where an entity is: its bottomleft as floats, its rect, and its rect before this frame's move"""
+    __slots__ = ("position", "rect", "previous_rect", "wraps")
+
+    def __init__(self, rect, wraps=True):
+        """Initialize the transform"""
+        self.rect = rect
+        self.position = vector(rect.bottomleft)
+        self.previous_rect = rect.copy()
+        self.wraps = wraps
+
+
+class Velocity():
+    """How far an entity moves each frame (max_speed caps the horizontal part)"""
+    __slots__ = ("velocity", "max_speed")
+
+    def __init__(self, x, y, max_speed=None):
+        """Initialize the velocity"""
+        self.velocity = vector(x, y)
+        self.max_speed = max_speed
+
+
+class Gravity():
+    """How much an entity's velocity changes each frame"""
+    __slots__ = ("acceleration",)
+
+    def __init__(self, x, y):
+        """Initialize the gravity"""
+        self.acceleration = vector(x, y)
+
+
+class Animation():
+    """The frames an entity is showing, how fast it steps through them and what happens at the last one"""
+    __slots__ = ("frames", "speed", "frame", "on_end")
+
+    def __init__(self, frames, speed, frame=0, on_end=None):
+        """Initialize the animation (without on_end it loops)"""
+        self.frames = frames
+        self.speed = speed
+        self.frame = frame
+        self.on_end = on_end
+
+    def play(self, frames, speed, on_end=None):
+        """Start a different animation from its first frame"""
+        self.frames = frames
+        self.speed = speed
+        self.frame = 0
+        self.on_end = on_end
+
+
+class Collider():
+    """How deep an entity sinks into the platforms it lands on, the columns trimmed off its sides, and if it bumps its head"""
+    __slots__ = ("rest_depth", "insets", "hits_ceiling")
+
+    def __init__(self, rest_depth, insets=(0, 0), hits_ceiling=False):
+        """Initialize the collider"""
+        self.rest_depth = rest_depth
+        self.insets = insets
+        self.hits_ceiling = hits_ceiling
+
+
+class PortalTraveller():
+    """Where an entity comes out of a portal, the sound it makes and the telemetry traveller kind"""
+    __slots__ = ("get_exit", "sound", "kind")
+
+    def __init__(self, get_exit, sound, kind):
+        """Initialize the portal traveller"""
+        self.get_exit = get_exit
+        self.sound = sound
+        self.kind = kind
+
+
+class Chaser():
+    """An entity that walks toward the player along the level's flow field, with a walk animation for each direction"""
+    __slots__ = ("direction", "walk_frames")
+
+    def __init__(self, direction, left_frames, right_frames):
+        """Initialize the chaser"""
+        self.direction = direction
+        self.walk_frames = {-1: left_frames, 1: right_frames}
+
+
+class Projectile():
+    """An entity that disappears after travelling range pixels from starting_x"""
+    __slots__ = ("starting_x", "range")
+
+    def __init__(self, starting_x, range):
+        """Initialize the projectile"""
+        self.starting_x = starting_x
+        self.range = range
+
+
+class Sleeper():
+    """An entity that goes to sleep after standing still for rest_frames frames in a row"""
+    __slots__ = ("rest_frames", "still_frames")
+
+    def __init__(self, rest_frames):
+        """Initialize the sleeper"""
+        self.rest_frames = rest_frames
+        self.still_frames = 0
+
+
+class ComponentStore():
+    """A class to keep one kind of component for many entities in two parallel lists with no gaps"""
+
+    def __init__(self):
+        """Initialize the store"""
+        self.entities = []
+        self.components = []
+        self.slots = {}
+
+    def __len__(self):
+        """Get how many entities have the component"""
+        return len(self.entities)
+
+    def __contains__(self, entity):
+        """Check if an entity's component is in the store"""
+        return entity in self.slots
+
+    def add(self, entity, component):
+        """Add an entity's component at the end"""
+        if entity in self.slots:
+            return
+        self.slots[entity] = len(self.entities)
+        self.entities.append(entity)
+        self.components.append(component)
+
+    def remove(self, entity):
+        """Remove an entity's component, moving the last one into its slot"""
+        slot = self.slots.pop(entity, None)
+        if slot is None:
+            return
+        last_entity = self.entities.pop()
+        last_component = self.components.pop()
+        if last_entity is not entity:
+            self.entities[slot] = last_entity
+            self.components[slot] = last_component
+            self.slots[last_entity] = slot
+
+
+class Entity(pygame.sprite.Sprite):
+    """A sprite made of components, updated by the systems of the EntityGroups it belongs to"""
+
+    def __init__(self):
+        """Initialize the entity"""
+        super().__init__()
+        self.components = {}
+        self.disabled = set()
+        self.systems = None
+        self.is_active = True
+        self.is_sleeping = False
+        self.sleeping_components = []
+        self.chunk_key = None
+
+    def add_component(self, name, component):
+        """Give the entity a component"""
+        self.components[name] = component
+        if self.systems and name not in self.disabled:
+            self.systems.stores[name].add(self, component)
+            if name == "transform":
+                self.systems.place(self)
+
+    def disable_component(self, name):
+        """Stop the systems updating one of the entity's components (it keeps its values)"""
+        self.disabled.add(name)
+        if self.systems:
+            self.systems.stores[name].remove(self)
+
+    def enable_component(self, name):
+        """Have the systems update a disabled component again"""
+        self.disabled.discard(name)
+        if self.systems:
+            self.systems.stores[name].add(self, self.components[name])
+
+    def sleep(self):
+        """Stop moving, colliding and using portals until woken (the components keep their values)"""
+        if self.is_sleeping:
+            return
+        self.is_sleeping = True
+        self.sleeping_components = [name for name in SLEEP_COMPONENT_NAMES
+                                    if name in self.components and name not in self.disabled]
+        for name in self.sleeping_components:
+            self.disable_component(name)
+        if self.systems:
+            self.systems.sleeping.add(self)
+
+    def wake(self):
+        """Move and collide again"""
+        if not self.is_sleeping:
+            return
+        self.is_sleeping = False
+        for name in self.sleeping_components:
+            self.enable_component(name)
+        self.sleeping_components = []
+        if "sleeper" in self.components:
+            self.components["sleeper"].still_frames = 0
+        if self.systems:
+            self.systems.sleeping.discard(self)
+
+    def add_internal(self, group):
+        """Join the group's systems when added to an EntityGroup"""
+        super().add_internal(group)
+        systems = getattr(group, "systems", None)
+        if systems and self.systems is None:
+            systems.add_entity(self)
+
+    def remove_internal(self, group):
+        """Leave the systems once the entity is in no group"""
+        super().remove_internal(group)
+        if self.systems and not self.alive():
+            self.systems.remove_entity(self)
+
+    def kill(self):
+        """Remove the entity from every group and its systems"""
+        super().kill()
+        if self.systems:
+            self.systems.remove_entity(self)
+
+    @property
+    def position(self):
+        """Get the entity's bottomleft as a vector"""
+        return self.components["transform"].position
+
+    @position.setter
+    def position(self, position):
+        """Move the entity (the vector the systems hold is updated in place)"""
+        self.components["transform"].position.update(position)
+        if self.systems:
+            self.systems.place(self)
+
+    @property
+    def velocity(self):
+        """Get the entity's velocity as a vector"""
+        return self.components["velocity"].velocity
+
+    @velocity.setter
+    def velocity(self, velocity):
+        """Set the entity's velocity (the vector the systems hold is updated in place)"""
+        self.components["velocity"].velocity.update(velocity)
+
+    @property
+    def acceleration(self):
+        """Get the entity's acceleration as a vector"""
+        return self.components["gravity"].acceleration
+
+    @property
+    def previous_rect(self):
+        """Get the entity's rect before this frame's move"""
+        return self.components["transform"].previous_rect
+
+    @property
+    def current_sprite(self):
+        """Get the entity's animation frame index"""
+        return self.components["animation"].frame
+
+
+class EntityGroup(pygame.sprite.Group):
+    """A sprite group whose entities are updated by a level's systems while they belong to it"""
+
+    def __init__(self, systems, *sprites):
+        """Initialize the group"""
+        self.systems = systems
+        super().__init__(*sprites)
+
+
+class EntitySystems():
+    """A class to keep the components of a level's entities and run each system over all of them in turn"""
+
+    def __init__(self, platform_group, portal_group=None, flow_field=None):
+        """Initialize the systems"""
+        self.stores = {name: ComponentStore() for name in COMPONENT_NAMES}
+        self.platform_group = platform_group
+        self.portal_group = portal_group
+
+        # Sleeping entities, and how many moving entities were awake and asleep last frame and in total
+        self.sleeping = set()
+        self.awake_count = 0
+        self.sleeping_count = 0
+        self.total_awake_count = 0
+        self.total_sleeping_count = 0
+        self.frame_count = 0
+
+        # Chasers turn toward the player along this flow field (None keeps them walking straight)
+        self.flow_field = flow_field
+
+        # Entities by the (chunk_x, chunk_y) their bottomleft is in (dicts keep the order they were filed in),
+        # and the ones mark_active set active last frame
+        self.chunk_pixels = settings.CHUNK_SIZE * settings.TILE_SIZE
+        self.chunk_entities = {}
+        self.active_entities = []
+
+    def add_entity(self, entity):
+        """Add an entity's enabled components to the stores"""
+        entity.systems = self
+        for name, component in entity.components.items():
+            if name not in entity.disabled:
+                self.stores[name].add(entity, component)
+        if entity.is_sleeping:
+            self.sleeping.add(entity)
+        if "transform" in entity.components:
+            self.place(entity)
+        #A new entity is active until the next mark_active checks where it is
+        if entity.is_active:
+            self.active_entities.append(entity)
+
+    def remove_entity(self, entity):
+        """Remove all of an entity's components from the stores"""
+        for name in entity.components:
+            self.stores[name].remove(entity)
+        self.sleeping.discard(entity)
+        self.unplace(entity)
+        entity.systems = None
+
+    def place(self, entity):
+        """File an entity under the chunk its bottomleft is in, if it isn't there already"""
+        position = entity.components["transform"].position
+        key = (int(position.x // self.chunk_pixels), int(position.y // self.chunk_pixels))
+        if key == entity.chunk_key:
+            return
+        self.unplace(entity)
+        self.chunk_entities.setdefault(key, {})[entity] = None
+        entity.chunk_key = key
+
+    def unplace(self, entity):
+        """Take an entity out of the chunk it is filed under"""
+        if entity.chunk_key is None:
+            return
+        chunk = self.chunk_entities[entity.chunk_key]
+        del chunk[entity]
+        if not chunk:
+            del self.chunk_entities[entity.chunk_key]
+        entity.chunk_key = None
+
+    def get_entities_near(self, rect):
+        """Get the entities that could touch rect: the ones filed under its chunks, the column left of them and the row below
+
+        No entity is bigger than a chunk, so one whose rect reaches into
+        rect has its bottomleft at most one chunk left of or below it.
+        """
+        chunk_pixels = self.chunk_pixels
+        chunk_entities = self.chunk_entities
+        entities = []
+        for chunk_y in range(rect.top // chunk_pixels, (rect.bottom - 1) // chunk_pixels + 2):
+            for chunk_x in range(rect.left // chunk_pixels - 1, (rect.right - 1) // chunk_pixels + 1):
+                chunk = chunk_entities.get((chunk_x, chunk_y))
+                if chunk:
+                    entities.extend(chunk)
+        return entities
+
+    def update(self, active_rect):
+        """Run every system once over the entities inside active_rect, everything else waits frozen"""
+        self.mark_active(active_rect)
+        self.steer()
+        self.move()
+        self.collide()
+        self.travel()
+        self.refile()
+        self.settle()
+        self.animate()
+        self.fly()
+
+        self.awake_count = len(self.stores["velocity"])
+        self.sleeping_count = len(self.sleeping)
+        self.total_awake_count += self.awake_count
+        self.total_sleeping_count += self.sleeping_count
+        self.frame_count += 1
+
+    def mark_active(self, active_rect):
+        """Mark which entities are inside the loaded chunks, only visiting the entities filed near them"""
+        for entity in self.active_entities:
+            entity.is_active = False
+
+        is_inside = active_rect.colliderect
+        active_entities = []
+        for entity in self.get_entities_near(active_rect):
+            if is_inside(entity.components["transform"].rect):
+                entity.is_active = True
+                active_entities.append(entity)
+        self.active_entities = active_entities
+
+    def steer(self):
+        """Turn chasers standing on a platform toward the player with a single flow field lookup each"""
+        flow_field = self.flow_field
+        for entity, chaser in zip(self.stores["chaser"].entities, self.stores["chaser"].components):
+            if not entity.is_active:
+                continue
+            components = entity.components
+            velocity = components["velocity"].velocity
+            if flow_field and velocity.y == 0:
+                direction = flow_field.direction_at(components["transform"].rect)
+                if direction and direction != chaser.direction:
+                    chaser.direction = direction
+                    velocity.x = -velocity.x
+            components["animation"].frames = chaser.walk_frames[chaser.direction]
+
+    def move(self):
+        """Apply gravity and velocity to every moving entity, wrapping around the sides of the world"""
+        movers = list(zip(self.stores["velocity"].entities, self.stores["velocity"].components))
+        for entity, velocity in movers:
+            if entity.is_active:
+                transform = entity.components["transform"]
+                transform.previous_rect = transform.rect.copy()
+                transform.previous_rect.bottomleft = transform.position
+
+        # Half of this frame's change in velocity is travelled this frame
+        for entity, gravity in zip(self.stores["gravity"].entities, self.stores["gravity"].components):
+            if entity.is_active:
+                components = entity.components
+                components["velocity"].velocity += gravity.acceleration
+                components["transform"].position += 0.5 * gravity.acceleration
+
+        world_width = settings.WORLD_WIDTH
+        for entity, velocity in movers:
+            if not entity.is_active:
+                continue
+            transform = entity.components["transform"]
+            position = transform.position
+            position += velocity.velocity
+
+            if transform.wraps:
+                if position.x < 0:
+                    position.x = world_width
+                elif position.x > world_width:
+                    position.x = 0
+
+            if velocity.max_speed and abs(velocity.velocity.x) > velocity.max_speed:
+                velocity.velocity.x = velocity.max_speed if velocity.velocity.x > 0 else -velocity.max_speed
+
+            transform.rect.bottomleft = position
+
+    def collide(self):
+        """Land falling entities on the first platform they crossed this frame and stop rising ones at ceilings"""
+        platform_group = self.platform_group
+        for entity, collider in zip(self.stores["collider"].entities, self.stores["collider"].components):
+            if not entity.is_active:
+                continue
+            components = entity.components
+            transform = components["transform"]
+            velocity = components["velocity"].velocity
+
+            # Swept, so a fast fall can't skip a platform
+            if velocity.y > 0:
+                platform = sweep_landing(transform.previous_rect, transform.rect, platform_group, collider.rest_depth, collider.insets)
+                if platform:
+                    transform.position.y = platform.rect.top + collider.rest_depth
+                    velocity.y = 0
+
+            if velocity.y < 0 and collider.hits_ceiling:
+                platform = sweep_ceiling(transform.previous_rect, transform.rect, platform_group, collider.insets)
+                if platform:
+                    velocity.y = 0
+                    transform.position.y = platform.rect.bottom + transform.rect.height
+                    transform.rect.bottomleft = transform.position
+
+    def travel(self):
+        """Send every entity touching a portal out of its exit"""
+        portal_rects = [portal.rect for portal in self.portal_group or ()]
+        if not portal_rects:
+            return
+        for entity, traveller in zip(self.stores["traveller"].entities, self.stores["traveller"].components):
+            if not entity.is_active:
+                continue
+            transform = entity.components["transform"]
+            if transform.rect.collidelist(portal_rects) != -1:
+                telemetry.record(telemetry.PORTAL, transform.rect.centerx, transform.rect.centery, traveller.kind)
+                traveller.sound.play()
+                transform.position.update(traveller.get_exit(transform.position.x, transform.position.y))
+                transform.rect.bottomleft = transform.position
+
+    def refile(self):
+        """File the active entities under the chunk they ended up in this frame"""
+        for entity in self.active_entities:
+            if entity.systems is self:
+                self.place(entity)
+
+    def settle(self):
+        """Put sleepers that stayed in place with no velocity long enough to sleep"""
+        for entity, sleeper in list(zip(self.stores["sleeper"].entities, self.stores["sleeper"].components)):
+            if not entity.is_active:
+                continue
+            components = entity.components
+            transform = components["transform"]
+            velocity = components["velocity"].velocity
+            if velocity.x == 0 and velocity.y == 0 and transform.position == transform.previous_rect.bottomleft:
+                sleeper.still_frames += 1
+                if sleeper.still_frames >= sleeper.rest_frames:
+                    entity.sleep()
+            else:
+                sleeper.still_frames = 0
+
+    def wake_touching(self, rect):
+        """Wake every sleeping entity touching rect"""
+        for entity in list(self.sleeping):
+            if entity.rect.colliderect(rect):
+                entity.wake()
+
+    def wake_all(self):
+        """Wake every sleeping entity"""
+        for entity in list(self.sleeping):
+            entity.wake()
+
+    def report(self):
+        """Print the average moving entities awake and asleep per frame"""
+        if not self.frame_count:
+            return
+        frames = self.frame_count
+        print(f"Entities: {frames} frames, {self.total_awake_count / frames:.1f} awake and "
+              f"{self.total_sleeping_count / frames:.1f} sleeping per frame")
+
+    def animate(self):
+        """Step every animation, looping it or handing its last frame to on_end"""
+        for entity, animation in list(zip(self.stores["animation"].entities, self.stores["animation"].components)):
+            if not entity.is_active:
+                continue
+            if animation.frame < len(animation.frames) - 1:
+                animation.frame += animation.speed
+            elif animation.on_end:
+                animation.on_end()
+            else:
+                animation.frame = 0
+            entity.image = animation.frames[int(animation.frame)]
+
+    def fly(self):
+        """Cover the area projectiles swept this frame and remove the ones past their range"""
+        for entity, projectile in list(zip(self.stores["projectile"].entities, self.stores["projectile"].components)):
+            if not entity.is_active:
+                continue
+            transform = entity.components["transform"]
+            entity.swept_rect = transform.previous_rect.union(transform.rect)
+            if abs(transform.rect.x - projectile.starting_x) > projectile.range:
+                entity.kill()
@@ -0,0 +1,246 @@
+"""Lazily initialized pygame subsystems and asset loading
+
+Nothing here touches pygame until it is first needed: the window opens
+on the first call to get_display_surface, the mixer on the first sound
+and the font module on the first font. Sound effects are not even
+decoded until they first play.
+"""
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import pygame
+
+from zombie_knight.settings import SOUND_CACHE_BYTES, WINDOW_HEIGHT, WINDOW_WIDTH
+
+# Compressed music formats tried before the file named by the caller (the music module streams them from disk)
+MUSIC_FORMATS = (".ogg", ".mp3")
+
+# The window, opened on first use
+_display_surface = None
+
+# Images by relative path, each file is read from disk once
+_images = {}
+
+# Scaled (and flipped) frames by (relative path, size, flipped), shared by every sprite that shows them
+_frames = {}
+
+# Sounds by relative path and fonts by (relative path, size)
+_sounds = {}
+_fonts = {}
+
+# Decoded sound effects by relative path as (Sound, bytes), least recently played first
+_decoded_sounds = OrderedDict()
+_decoded_bytes = 0
+
+# How long audio took to load and decode
+_audio_stats = {"music_path": None, "music_time": 0.0, "decode_count": 0, "decode_time": 0.0, "eviction_count": 0}
+
+
+class LazySound():
+    """A sound effect that is decoded the first time it plays (and again if the cache dropped it since)"""
+
+    def __init__(self, relative_path):
+        """Initialize the sound"""
+        self.relative_path = relative_path
+
+    def play(self, *args, **kwargs):
+        """Play the sound, decoding it first if needed"""
+        return decode_sound(self.relative_path).play(*args, **kwargs)
+
+
+def resource_path(relative_path):
+    """ Get the absolute path to the resource, works for dev and for PyInstaller """
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except AttributeError:
+        base_path = os.path.abspath(".")
+
+    return os.path.join(base_path, relative_path)
+
+
+def get_display_surface():
+    """Get the window surface, opening the window the first time"""
+    global _display_surface
+    if _display_surface is None:
+        pygame.display.init()
+        _display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Zombie Knight")
+    return _display_surface
+
+
+def init_mixer():
+    """Start the mixer if it is not running yet"""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+
+def init_font():
+    """Start the font module if it is not running yet"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def load_sound(relative_path):
+    """Get a sound effect that decodes on first play, every caller shares one per file"""
+    if relative_path not in _sounds:
+        _sounds[relative_path] = LazySound(relative_path)
+    return _sounds[relative_path]
+
+
+def decode_sound(relative_path):
+    """Get a decoded sound effect from the cache, decoding it and dropping the least recently played if needed"""
+    global _decoded_bytes
+    if relative_path in _decoded_sounds:
+        _decoded_sounds.move_to_end(relative_path)
+        return _decoded_sounds[relative_path][0]
+
+    init_mixer()
+    start = time.perf_counter()
+    sound = pygame.mixer.Sound(resource_path(relative_path))
+    _audio_stats["decode_time"] += time.perf_counter() - start
+    _audio_stats["decode_count"] += 1
+
+    # Size in the mixer's format: samples * bytes per sample * channels
+    frequency, size, channels = pygame.mixer.get_init()
+    sound_bytes = int(sound.get_length() * frequency) * (abs(size) // 8) * channels
+    _decoded_sounds[relative_path] = (sound, sound_bytes)
+    _decoded_bytes += sound_bytes
+
+    while _decoded_bytes > SOUND_CACHE_BYTES and len(_decoded_sounds) > 1:
+        drop_decoded_sound(next(iter(_decoded_sounds)))
+        _audio_stats["eviction_count"] += 1
+    return sound
+
+
+def drop_decoded_sound(relative_path):
+    """Forget the decoded copy of a sound effect (a channel still playing it keeps it alive until it ends)"""
+    global _decoded_bytes
+    if relative_path in _decoded_sounds:
+        _decoded_bytes -= _decoded_sounds.pop(relative_path)[1]
+
+
+def get_decoded_sounds():
+    """Get the decoded sound effects the cache holds, least recently played first"""
+    return [sound for sound, sound_bytes in _decoded_sounds.values()]
+
+
+def load_music(relative_path):
+    """Load the music track that pygame.mixer.music streams from disk, preferring a compressed copy of it
+
+    A missing or unreadable track is reported and the game plays without music.
+    """
+    init_mixer()
+    stem = os.path.splitext(relative_path)[0]
+    for extension in MUSIC_FORMATS:
+        if os.path.exists(resource_path(stem + extension)):
+            relative_path = stem + extension
+            break
+
+    start = time.perf_counter()
+    try:
+        pygame.mixer.music.load(resource_path(relative_path))
+    except pygame.error as error:
+        print(f"Warning: could not load music {relative_path}, playing without it ({error})")
+        _audio_stats["music_path"] = None
+        return
+    _audio_stats["music_time"] = time.perf_counter() - start
+    _audio_stats["music_path"] = relative_path
+
+
+def play_music():
+    """Play the loaded music track from the start on a loop (nothing happens if there is none)"""
+    if _audio_stats["music_path"]:
+        pygame.mixer.music.play(-1, 0.0)
+
+
+def report_audio():
+    """Print how long music and sound effects took to load and how much memory decoded sounds hold"""
+    stats = _audio_stats
+    if stats["music_path"]:
+        music_size = os.path.getsize(resource_path(stats["music_path"]))
+        print(f"Audio: music {stats['music_path']} streamed from {music_size / 1024:.0f} KiB on disk, "
+              f"opened in {stats['music_time'] * 1000:.1f} ms")
+    print(f"  {stats['decode_count']} effect decodes in {stats['decode_time'] * 1000:.1f} ms, "
+          f"{len(get_decoded_sounds())} of {len(_sounds)} effects resident in {_decoded_bytes / 1024:.0f} KiB "
+          f"(cache {SOUND_CACHE_BYTES / 1024:.0f} KiB), {stats['eviction_count']} evicted")
+
+
+def load_font(relative_path, size):
+    """Load a font at a point size"""
+    if (relative_path, size) not in _fonts:
+        init_font()
+        _fonts[(relative_path, size)] = pygame.font.Font(resource_path(relative_path), size)
+    return _fonts[(relative_path, size)]
+
+
+def load_image(relative_path):
+    """Load an image, reading each file only once (callers scale and flip copies of it)"""
+    if relative_path not in _images:
+        _images[relative_path] = pygame.image.load(resource_path(relative_path))
+    return _images[relative_path]
+
+
+def load_frame(relative_path, size, flip=False):
+    """Load an image scaled to size (and mirrored left to right if flip), making each frame only once"""
+    key = (relative_path, size, flip)
+    if key not in _frames:
+        frame = pygame.transform.scale(load_image(relative_path), size)
+        _frames[key] = pygame.transform.flip(frame, True, False) if flip else frame
+    return _frames[key]
+
+
+def get_frame_key(frame):
+    """Get the (relative path, size, flip) load_frame made a frame from, None for any other surface"""
+    for key, cached_frame in _frames.items():
+        if cached_frame is frame:
+            return key
+    return None
+
+
+def reload_image(relative_path):
+    """Read an image from disk again and redraw every frame made from it in place, return the frames that changed"""
+    _images[relative_path] = pygame.image.load(resource_path(relative_path))
+
+    # Sprites keep references to their frames, so the new pixels are copied into the old surfaces
+    frames = []
+    for (path, size, flip), frame in _frames.items():
+        if path == relative_path:
+            new_frame = pygame.transform.scale(_images[relative_path], size)
+            if flip:
+                new_frame = pygame.transform.flip(new_frame, True, False)
+            frame.fill((0, 0, 0, 0))
+            frame.blit(new_frame, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            frames.append(frame)
+    return frames
+
+
+def reload_sound(relative_path):
+    """Drop the decoded copy of a sound so its next play reads the file again, return True if the game uses it"""
+    drop_decoded_sound(relative_path)
+    return relative_path in _sounds
+
+
+def reload_font(relative_path):
+    """Read a font from disk again at every size it is used, return the (old, new) Font pairs"""
+    fonts = []
+    for path, size in list(_fonts):
+        if path == relative_path:
+            old_font = _fonts.pop((path, size))
+            fonts.append((old_font, load_font(path, size)))
+    return fonts
+
+
+def preload_images(directory="images"):
+    """Read every image under a directory into the cache and return how many were loaded"""
+    root = resource_path(directory)
+    count = 0
+    for folder, subfolders, files in os.walk(root):
+        for name in files:
+            if name.endswith(".png"):
+                relative_path = os.path.relpath(os.path.join(folder, name), resource_path("."))
+                load_image(relative_path.replace(os.sep, "/"))
+                count += 1
+    return count
@@ -0,0 +1,268 @@
+"""Gameplay rules: scoring, rounds, collisions between sprites and the HUD"""
+import pygame
+
+from zombie_knight import telemetry
+from zombie_knight.collision import collide_swept
+from zombie_knight.engine import get_display_surface, load_font, load_music, load_sound, play_music
+from zombie_knight.scheduler import Scheduler
+from zombie_knight.settings import FPS, WINDOW_HEIGHT, WINDOW_WIDTH
+from zombie_knight.sprites import Ruby, Zombie
+
+
+class Game():
+    """A class to help manage gameplay"""
+
+    def __init__(self, player, zombie_group, platform_group, portal_group, bullet_group, ruby_group, flow_field=None, particle_system=None):
+        """Initialize the game"""
+        self.STARTING_ROUND_TIME = 30
+        self.STARTING_ZOMBIE_CREATION_TIME = 5
+
+        self.score = 0
+        self.round_number = 1
+        self.round_time = self.STARTING_ROUND_TIME
+        self.zombie_creation_time = self.STARTING_ZOMBIE_CREATION_TIME
+
+        # Set fonts
+        self.title_font = load_font("fonts/Poultrygeist.ttf", 48)
+        self.HUD_font = load_font("fonts/Pixel.ttf", 24)
+
+        # Set sounds
+        self.lost_ruby_sound = load_sound("sounds/lost_ruby.wav")
+        self.ruby_pickup_sound = load_sound("sounds/ruby_pickup.wav")
+        load_music("sounds/level_music.wav")
+
+        # Attach groups and sprites
+        self.player = player
+        self.zombie_group = zombie_group
+        self.platform_group = platform_group
+        self.portal_group = portal_group
+        self.bullet_group = bullet_group
+        self.ruby_group = ruby_group
+
+        # Zombies chase the player along this flow field (None keeps them walking straight)
+        self.flow_field = flow_field
+
+        # Hit, death and pickup effects (None plays sounds only)
+        self.particle_system = particle_system
+
+        self.is_paused = False  # Add a pause state
+        self.is_headless = False  # A server never waits on a pause screen
+        self.wait_for_unpause = None  # Set when another thread shows the pause screen and handles its keys
+
+        # Spawns, zombie rises and the sunrise clock wait here instead of counting frames themselves
+        self.scheduler = Scheduler()
+        self.start_round_timer()
+
+    def update(self):
+        """Update the game"""
+        if self.is_paused:
+            return  # If paused, do nothing
+
+        self.scheduler.tick()
+
+        if self.flow_field:
+            self.flow_field.update(self.player)
+
+        self.check_collisions()
+        self.check_game_over()
+
+    def start_round_timer(self):
+        """Drop any waiting events and start the sunrise clock"""
+        self.scheduler.clear()
+        self.scheduler.schedule(FPS, self.tick_round_time)
+
+    def tick_round_time(self):
+        """Count down a second to sunrise"""
+        self.round_time -= 1
+        self.add_zombie()
+        if not self.check_round_completion():
+            self.scheduler.schedule(FPS, self.tick_round_time)
+
+    def draw(self):
+        """Draw the game HUD"""
+        self.draw_hud(*self.get_hud())
+
+    def get_hud(self):
+        """Get the values the HUD shows (score, health, night, sunrise in)"""
+        return self.score, self.player.health, self.round_number, self.round_time
+
+    def draw_hud(self, score, health, round_number, round_time):
+        """Draw the HUD for the given values"""
+        # Set colors
+        WHITE = (255, 255, 255)
+        GREEN = (25, 200, 25)
+
+        # Set text
+        score_text = self.HUD_font.render("Score: " + str(score), True, WHITE)
+        score_rect = score_text.get_rect()
+        score_rect.topleft = (10, WINDOW_HEIGHT - 50)
+
+        health_text = self.HUD_font.render("Health: " + str(health), True, WHITE)
+        health_rect = health_text.get_rect()
+        health_rect.topleft = (10, WINDOW_HEIGHT - 25)
+
+        title_text = self.title_font.render("Zombie Knight", True, GREEN)
+        title_rect = title_text.get_rect()
+        title_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT - 25)
+
+        round_text = self.HUD_font.render("Night: " + str(round_number), True, WHITE)
+        round_rect = round_text.get_rect()
+        round_rect.topright = (WINDOW_WIDTH - 10, WINDOW_HEIGHT - 50)
+
+        time_text = self.HUD_font.render("Sunrise In: " + str(round_time), True, WHITE)
+        time_rect = time_text.get_rect()
+        time_rect.topright = (WINDOW_WIDTH - 10, WINDOW_HEIGHT - 25)
+
+        # Draw the HUD
+        display_surface = get_display_surface()
+        display_surface.blit(score_text, score_rect)
+        display_surface.blit(health_text, health_rect)
+        display_surface.blit(title_text, title_rect)
+        display_surface.blit(round_text, round_rect)
+        display_surface.blit(time_text, time_rect)
+
+    def add_zombie(self):
+        """Add a zombie to the game"""
+        if self.round_time % self.zombie_creation_time == 0:
+            zombie = Zombie(self.round_number, 5 + self.round_number)
+            self.zombie_group.add(zombie)
+
+    def check_collisions(self):
+        """Check collisions"""
+        # Check for bullet collisions with zombies
+        collision_dict = pygame.sprite.groupcollide(self.bullet_group, self.zombie_group, True, False, collide_swept)
+        if collision_dict:
+            for zombies in collision_dict.values():
+                for zombie in zombies:
+                    zombie.hit_sound.play()
+                    if not zombie.is_dead:
+                        zombie.rise_timer = self.scheduler.schedule(zombie.RISE_TIME * FPS, zombie.rise)
+                    zombie.die()
+                    if self.particle_system:
+                        self.particle_system.emit("hit", zombie.rect.centerx, zombie.rect.centery)
+                    telemetry.record(telemetry.ZOMBIE_HIT, zombie.rect.centerx, zombie.rect.centery, len(self.zombie_group))
+
+        # Check for player collisions with zombies
+        collision_list = pygame.sprite.spritecollide(self.player, self.zombie_group, False)
+        if collision_list:
+            for zombie in collision_list:
+                if zombie.is_dead:
+                    zombie.kick_sound.play()
+                    zombie.kill()
+                    if zombie.rise_timer:
+                        zombie.rise_timer.cancel()
+                    if self.particle_system:
+                        self.particle_system.emit("death", zombie.rect.centerx, zombie.rect.centery)
+                    self.score += 25
+                    telemetry.record(telemetry.ZOMBIE_KILL, zombie.rect.centerx, zombie.rect.centery, self.score)
+                    ruby = Ruby()
+                    self.ruby_group.add(ruby)
+                else:
+                    self.player.health -= 20
+                    self.player.hit_sound.play()
+                    telemetry.record(telemetry.PLAYER_HIT, self.player.rect.centerx, self.player.rect.centery, self.player.health)
+                    if self.particle_system:
+                        self.particle_system.emit("player_hit", self.player.rect.centerx, self.player.rect.centery)
+                    self.player.position.x -= 256 * zombie.direction
+                    self.player.rect.bottomleft = self.player.position
+
+        # Player collision with ruby
+        if pygame.sprite.spritecollide(self.player, self.ruby_group, True):
+            self.ruby_pickup_sound.play()
+            if self.particle_system:
+                self.particle_system.emit("pickup", self.player.rect.centerx, self.player.rect.centery)
+            self.score += 100
+            self.player.health += 10
+            if self.player.health > self.player.STARTING_HEALTH:
+                self.player.health = self.player.STARTING_HEALTH
+            telemetry.record(telemetry.RUBY_PICKUP, self.player.rect.centerx, self.player.rect.centery, self.score, self.player.health)
+
+    def check_round_completion(self):
+        """Check if round is over"""
+        if self.round_time == 0:
+            self.start_new_round()
+            return True
+        return False
+
+    def check_game_over(self):
+        """Check if game is over"""
+        if self.player.health <= 0:
+            telemetry.record(telemetry.GAME_OVER, self.player.rect.centerx, self.player.rect.centery,
+                             self.round_number, self.score, len(self.zombie_group))
+            pygame.mixer.music.stop()
+            self.pause_game("Game Over! Final Score: " + str(self.score), "Press 'Enter' to play again...")
+            self.reset_game()
+
+    def start_new_round(self):
+        """Start new round"""
+        telemetry.record(telemetry.NIGHT_SURVIVED, self.player.rect.centerx, self.player.rect.centery,
+                         self.round_number, self.score, len(self.zombie_group))
+        self.round_number += 1
+        if self.round_number < self.STARTING_ZOMBIE_CREATION_TIME:
+            self.zombie_creation_time -= 1
+        self.round_time = self.STARTING_ROUND_TIME
+        self.zombie_group.empty()
+        self.ruby_group.empty()
+        self.bullet_group.empty()
+        self.player.reset()
+        self.start_round_timer()
+        self.pause_game("You survived the night!", "Press 'Enter' to continue...")
+
+    def pause_game(self, main_text, sub_text):
+        """Pause the game"""
+        if self.is_headless:
+            print(main_text)
+            return
+
+        pygame.mixer.music.pause()
+
+        if self.wait_for_unpause:
+            self.wait_for_unpause(main_text, sub_text)
+            return
+
+        self.draw_pause_screen(main_text, sub_text)
+        pygame.display.update()
+
+        is_paused = True
+        while is_paused:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    is_paused = False
+                    pygame.mixer.music.stop()
+                    running = False  # Make sure this is handled
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        is_paused = False
+                        pygame.mixer.music.unpause()
+
+    def draw_pause_screen(self, main_text, sub_text):
+        """Draw the pause screen text on black"""
+        WHITE = (255, 255, 255)
+        GREEN = (25, 200, 25)
+
+        main_text = self.title_font.render(main_text, True, GREEN)
+        main_rect = main_text.get_rect()
+        main_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+
+        sub_text = self.title_font.render(sub_text, True, WHITE)
+        sub_rect = sub_text.get_rect()
+        sub_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 64)
+
+        display_surface = get_display_surface()
+        display_surface.fill((0, 0, 0))  # Fill the screen with black
+        display_surface.blit(main_text, main_rect)
+        display_surface.blit(sub_text, sub_rect)
+
+    def reset_game(self):
+        """Reset game state"""
+        self.score = 0
+        self.round_number = 1
+        self.round_time = self.STARTING_ROUND_TIME
+        self.zombie_creation_time = self.STARTING_ZOMBIE_CREATION_TIME
+        self.player.health = self.player.STARTING_HEALTH
+        self.player.reset()
+        self.zombie_group.empty()
+        self.ruby_group.empty()
+        self.bullet_group.empty()
+        self.start_round_timer()
+        play_music()
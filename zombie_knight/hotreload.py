@@ -0,0 +1,121 @@
+"""Development hot reload: poll asset and level files for changes and swap the new versions into the running game"""
+import os
+import time
+
+import pygame
+
+from zombie_knight import engine
+from zombie_knight.engine import resource_path
+from zombie_knight.level import load_tile_map
+from zombie_knight.settings import HOT_RELOAD_DIRECTORIES, HOT_RELOAD_INTERVAL
+
+
+def swap_references(objects, old, new):
+    """Point every attribute of the objects that holds old at new instead"""
+    for obj in objects:
+        for name, value in vars(obj).items():
+            if value is old:
+                setattr(obj, name, new)
+
+
+class HotReloader():
+    """A class to watch images, sounds, fonts and the tile map, and reload only what changed
+
+    Images are redrawn into the frames sprites already hold, so live
+    players, zombies, rubies, portals and tiles show the new art on the
+    next frame. Sounds are decoded again the next time they play, fonts are
+    swapped into the objects that use them, and an edited tile map
+    rebuilds only the chunks that changed.
+    """
+
+    def __init__(self, level, map_path=None, directories=HOT_RELOAD_DIRECTORIES, interval=HOT_RELOAD_INTERVAL):
+        """Initialize the hot reloader"""
+        self.level = level
+        self.map_path = map_path
+        self.directories = directories
+        self.interval = interval
+        self.check_time = time.perf_counter()
+        self.mtimes = self.scan()
+
+    def scan(self):
+        """Get the modification time of every watched file by relative path"""
+        mtimes = {}
+        root = resource_path(".")
+        for directory in self.directories:
+            for folder, subfolders, files in os.walk(resource_path(directory)):
+                for name in files:
+                    path = os.path.join(folder, name)
+                    relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+                    try:
+                        mtimes[relative_path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        continue
+        if self.map_path:
+            try:
+                mtimes[self.map_path] = os.stat(self.map_path).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+
+    def update(self):
+        """Check for changed files every interval seconds and reload them"""
+        now = time.perf_counter()
+        if now - self.check_time < self.interval:
+            return
+        self.check_time = now
+
+        mtimes = self.scan()
+        changed = [path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime]
+        self.mtimes = mtimes
+        for path in changed:
+            start = time.perf_counter()
+            try:
+                result = self.reload(path)
+            except (pygame.error, OSError, ValueError) as error:
+                print(f"Hot reload: could not reload {path}: {error}")
+                continue
+            if result:
+                print(f"Hot reload: {path} ({result}) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def get_live_objects(self):
+        """Get the game and every sprite that can hold a font"""
+        level = self.level
+        return ([level.game, level.player] + level.zombie_group.sprites() + level.ruby_group.sprites() +
+                level.portal_group.sprites() + level.bullet_group.sprites())
+
+    def reload(self, path):
+        """Reload one changed file and describe what was rebuilt (None if nothing uses it)"""
+        if path == self.map_path:
+            chunk_count = self.level.reload_tile_map(load_tile_map(path))
+            return f"{chunk_count} chunks rebuilt"
+        if path.endswith(".png"):
+            return self.reload_image(path)
+        if path.endswith((".wav", ".ogg", ".mp3")):
+            if engine.reload_sound(path):
+                return "decoded again on its next play"
+        if path.endswith(".ttf"):
+            fonts = engine.reload_font(path)
+            for old_font, new_font in fonts:
+                swap_references(self.get_live_objects(), old_font, new_font)
+            if fonts:
+                return f"{len(fonts)} font sizes swapped"
+        return None
+
+    def reload_image(self, path):
+        """Redraw the frames made from an image and rebuild what depends on their pixels"""
+        frames = engine.reload_image(path)
+        if not frames:
+            return None
+        level = self.level
+
+        # Chunks have tiles drawn into them
+        chunk_count = 0
+        if path.startswith("images/tiles/"):
+            tile_id = int(path.rsplit("(", 1)[1].split(")")[0])
+            chunk_count = level.world.rebuild_chunks(tile_ids={tile_id})
+
+        # The knight lands on the visible part of its frames
+        if path.startswith("images/player/"):
+            level.player.update_hitbox_insets()
+
+        return f"{len(frames)} frames, {chunk_count} chunks rebuilt"
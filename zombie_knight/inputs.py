@@ -0,0 +1,108 @@
+"""Keyboard input: timestamped presses, buffered jumps and shots, and input latency measurement"""
+import time
+from collections import deque
+
+import pygame
+
+from zombie_knight.settings import INPUT_BUFFER_FRAMES, INPUT_LATENCY_SAMPLES
+
+JUMP = "jump"
+FIRE = "fire"
+
+
+def get_percentiles(latencies):
+    """Get the p50, p95, p99 and max of a list of latencies in milliseconds"""
+    latencies = sorted(latencies)
+    return [latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000 for fraction in (0.5, 0.95, 0.99, 1)]
+
+
+class InputHandler():
+    """A class to turn key presses into player actions, holding them a few frames until the player can act on them
+
+    A jump pressed just before landing waits until the knight is on a
+    platform, and shots pressed faster than one a frame queue up, instead of
+    either being lost. Each press is timed from when it was read until the
+    simulation acted on it, and until the frame showing that was presented.
+    """
+
+    def __init__(self, player, buffer_frames=INPUT_BUFFER_FRAMES):
+        """Initialize the input handler"""
+        self.player = player
+        self.buffer_frames = buffer_frames
+        self.player.input_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+
+        # (action, time) read from events, [action, time, frames waited] waiting on the player, (frame, time) not on screen yet
+        self.pressed = deque()
+        self.pending = []
+        self.applied = deque()
+
+        # Latencies in seconds, only the most recent are kept
+        self.simulation_latencies = deque(maxlen=INPUT_LATENCY_SAMPLES)
+        self.present_latencies = deque(maxlen=INPUT_LATENCY_SAMPLES)
+        self.press_count = 0
+        self.expired_count = 0
+
+    def handle_event(self, event):
+        """Record a jump or fire key press"""
+        if event.type == pygame.KEYDOWN:
+            # Player wants to jump
+            if event.key == pygame.K_SPACE:
+                self.press(JUMP)
+            # Player wants to fire
+            if event.key == pygame.K_UP:
+                self.press(FIRE)
+
+    def press(self, action):
+        """Record a jump or shot to act on before the next step"""
+        self.pressed.append((action, time.perf_counter()))
+        self.press_count += 1
+
+    def poll_keys(self):
+        """Read the held movement keys (swapped in whole so a simulation thread never sees half an update)"""
+        keys = pygame.key.get_pressed()
+        self.player.input_keys = {pygame.K_LEFT: keys[pygame.K_LEFT], pygame.K_RIGHT: keys[pygame.K_RIGHT]}
+
+    def apply(self, frame):
+        """Act on waiting presses before the simulation steps frame, drop the ones that waited too long"""
+        while self.pressed:
+            action, pressed_time = self.pressed.popleft()
+            self.pending.append([action, pressed_time, 0])
+        if not self.pending:
+            return
+
+        now = time.perf_counter()
+        has_fired = False
+        still_pending = []
+        for entry in self.pending:
+            action, pressed_time, frames_waited = entry
+            if action == JUMP:
+                is_done = self.player.jump()
+            elif not has_fired:
+                self.player.fire()
+                is_done = has_fired = True
+            else:
+                is_done = False
+
+            if is_done:
+                self.simulation_latencies.append(now - pressed_time)
+                self.applied.append((frame, pressed_time))
+            elif frames_waited >= self.buffer_frames:
+                self.expired_count += 1
+            else:
+                entry[2] += 1
+                still_pending.append(entry)
+        self.pending = still_pending
+
+    def presented(self, frame):
+        """Note that the result of every step before frame is on screen"""
+        now = time.perf_counter()
+        while self.applied and self.applied[0][0] < frame:
+            self.present_latencies.append(now - self.applied.popleft()[1])
+
+    def report(self):
+        """Print how many presses were used or dropped and the latency percentiles"""
+        print(f"Input: {self.press_count} presses, {self.expired_count} dropped after {self.buffer_frames} frames")
+        for name, latencies in (("simulation", self.simulation_latencies), ("present", self.present_latencies)):
+            if latencies:
+                p50, p95, p99, worst = get_percentiles(latencies)
+                print(f"  input to {name:<11} ms p50 {p50:6.2f} p95 {p95:6.2f} p99 {p99:6.2f} max {worst:6.2f}")
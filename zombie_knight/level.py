@@ -0,0 +1,197 @@
+"""The default level and the code that builds a tile map into a playable world"""
+import time
+from collections import namedtuple
+
+import pygame
+
+from zombie_knight import settings
+from zombie_knight.ecs import EntityGroup, EntitySystems
+from zombie_knight.engine import get_display_surface, load_frame
+from zombie_knight.game import Game
+from zombie_knight.navigation import FlowField
+from zombie_knight.particles import ParticleSystem
+from zombie_knight.render import (BACKGROUND_LAYER, BULLET_LAYER, PARTICLE_LAYER, PLAYER_LAYER, PORTAL_LAYER, RUBY_LAYER,
+                                  WORLD_LAYER, ZOMBIE_LAYER, RenderQueue, draw_blits)
+from zombie_knight.settings import TILE_SIZE
+from zombie_knight.sprites import Player, Portal
+from zombie_knight.world import Camera, World
+
+#Everything needed to draw one frame: (image, screen position) pairs in layer order and the HUD values
+#Nothing in it changes after it is made, so another thread can draw it while the next frame is simulated
+RenderSnapshot = namedtuple("RenderSnapshot", ["frame", "time", "blits", "hud"])
+
+#Create the tile map
+#0 -> no tile, 1 -> dirt, 2-5 -> platforms, 6 -> ruby maker, 7-8 -> portals, 9 -> player
+#23 rows and 40 columns (the default level, one screen)
+DEFAULT_TILE_MAP = [
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [7, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8, 0],
+    [4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 0, 0, 0, 0, 6, 0, 0, 0, 0, 0, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [4, 4, 4, 4, 4, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4, 4, 4, 4, 4],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4, 4, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [8, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 7, 0],
+    [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2],
+    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+]
+
+
+def load_tile_map(path):
+    """Read a tile map from a text file with one comma separated row per line"""
+    with open(path) as map_file:
+        return [[int(tile) for tile in line.split(",")] for line in map_file if line.strip()]
+
+
+class Level():
+    """A class to build a tile map into sprite groups, a streamed world and a game"""
+
+    def __init__(self, tile_map):
+        """Initialize the level"""
+        #Create sprite groups (sprites in the entity groups are moved, collided and animated by the systems)
+        self.platform_group = pygame.sprite.Group()
+        self.systems = EntitySystems(self.platform_group)
+
+        self.player_group = EntityGroup(self.systems)
+        self.bullet_group = EntityGroup(self.systems)
+
+        self.zombie_group = EntityGroup(self.systems)
+
+        self.portal_group = EntityGroup(self.systems)
+        self.ruby_group = EntityGroup(self.systems)
+        self.systems.portal_group = self.portal_group
+
+        #Keep the tile map so an edited copy can be compared against it
+        self.tile_map = tile_map
+
+        #Set the world size from the tile map
+        settings.set_world_size(len(tile_map[0]) * TILE_SIZE, len(tile_map) * TILE_SIZE)
+
+        #Dirt, platforms and ruby makers are built in chunks around the camera
+        self.world = World(tile_map, self.platform_group, self.systems)
+        self.camera = Camera(settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+
+        #Generate portals and the player from the tile map
+        #Loop through the lists (rows) in the tile map (i moves us down the map)
+        for i in range(len(tile_map)):
+            #Loop through the elements in a given list (cols) (j moves us across the map)
+            for j in range(len(tile_map[i])):
+                #Portals
+                if tile_map[i][j] == 7:
+                    Portal(j*32, i*32, "green", self.portal_group)
+                elif tile_map[i][j] == 8:
+                    Portal(j*32, i*32, "purple", self.portal_group)
+                #Player
+                elif tile_map[i][j] == 9:
+                    self.player = Player(j*32 - 32, i*32 + 32, self.platform_group, self.bullet_group)
+                    self.player_group.add(self.player)
+
+        #Compile the level into a navigation graph for the zombies
+        self.flow_field = FlowField(tile_map, self.portal_group)
+        self.systems.flow_field = self.flow_field
+
+        #Build the chunks around the player before the first frame
+        self.camera.follow(self.player.rect)
+        self.world.update(self.camera)
+
+        # Load in a background image
+        self.background_image = load_frame("images/background.png", (1280, 736))
+        self.background_rect = self.background_image.get_rect()
+        self.background_rect.topleft = (0, 0)
+
+        # Create a game
+        self.particle_system = ParticleSystem()
+        self.game = Game(self.player, self.zombie_group, self.platform_group, self.portal_group, self.bullet_group,
+                         self.ruby_group, self.flow_field, self.particle_system)
+        self.frame_count = 0
+
+        # Everything but the HUD is drawn from one layered queue
+        self.render_queue = RenderQueue()
+        self.render_queue.add_source(BACKGROUND_LAYER, self.get_background_blits)
+        self.render_queue.add_source(WORLD_LAYER, self.get_world_blits)
+        self.render_queue.add_group(PORTAL_LAYER, self.portal_group)
+        self.render_queue.add_group(PLAYER_LAYER, self.player_group)
+        self.render_queue.add_group(BULLET_LAYER, self.bullet_group)
+        self.render_queue.add_group(ZOMBIE_LAYER, self.zombie_group)
+        self.render_queue.add_group(RUBY_LAYER, self.ruby_group)
+        self.render_queue.add_source(PARTICLE_LAYER, self.particle_system.get_blits)
+
+    def update(self):
+        """Advance the camera, the loaded chunks, every entity and the game by one frame"""
+        # Move the camera and stream chunks in and out around it
+        self.camera.follow(self.player.rect)
+        self.world.update(self.camera)
+
+        # Steer the player, wake anything it touches, then run every system over the entities near the camera
+        self.player.control()
+        self.systems.wake_touching(self.player.rect)
+        self.systems.update(self.world.active_rect)
+        self.particle_system.update()
+
+        # Update the game
+        self.game.update()
+        self.frame_count += 1
+
+    def reload_tile_map(self, tile_map):
+        """Swap in an edited tile map, rebuilding only the chunks that changed and the zombies' navigation graph
+
+        Portals and the player keep their places until the game is restarted.
+        """
+        if len(tile_map) != len(self.tile_map) or len(tile_map[0]) != len(self.tile_map[0]):
+            #A different size changes every chunk
+            for key in list(self.world.chunks):
+                self.world.unload_chunk(*key)
+            settings.set_world_size(len(tile_map[0]) * TILE_SIZE, len(tile_map) * TILE_SIZE)
+            self.world = World(tile_map, self.platform_group, self.systems)
+            self.camera = Camera(settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+            self.systems.wake_all()
+            chunk_count = self.world.chunk_cols * self.world.chunk_rows
+        else:
+            changed = self.world.set_tile_map(tile_map)
+            self.world.rebuild_chunks(changed)
+            chunk_count = len(changed)
+        self.tile_map = tile_map
+
+        #Zombies find their way with the new layout
+        self.flow_field = FlowField(tile_map, self.portal_group)
+        self.game.flow_field = self.flow_field
+        self.systems.flow_field = self.flow_field
+
+        self.camera.follow(self.player.rect)
+        self.world.update(self.camera)
+        return chunk_count
+
+    def get_background_blits(self, camera):
+        """Get the background, which stays still behind the world"""
+        return [(self.background_image, self.background_rect.topleft)]
+
+    def get_world_blits(self, camera):
+        """Get the visible chunks (the world is replaced when an edited map changes size)"""
+        return self.world.get_blits(camera)
+
+    def capture(self):
+        """Get a snapshot of the render queue and the HUD"""
+        blits = self.render_queue.build(self.camera)
+        return RenderSnapshot(self.frame_count, time.perf_counter(), tuple(blits), self.game.get_hud())
+
+    def draw_snapshot(self, snapshot):
+        """Draw a snapshot with one call for the whole frame, then the HUD"""
+        draw_blits(get_display_surface(), snapshot.blits)
+        self.game.draw_hud(*snapshot.hud)
+
+    def draw(self):
+        """Draw the background, the visible chunks and sprites, the effects and the HUD"""
+        self.draw_snapshot(self.capture())
@@ -0,0 +1,174 @@
+"""Command line entry point: play the game, host a co-op server or join one"""
+import argparse
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+import pygame
+
+from zombie_knight import engine, telemetry
+from zombie_knight.hotreload import HotReloader
+from zombie_knight.inputs import InputHandler
+from zombie_knight.level import DEFAULT_TILE_MAP, Level, load_tile_map
+from zombie_knight.netplay import GameClient, GameServer
+from zombie_knight.replay import SessionRecorder, seed_random
+from zombie_knight.settings import DEFAULT_PORT, FPS, INPUT_BUFFER_FRAMES, SOAK_THRESHOLD
+from zombie_knight.soak import SoakTest
+from zombie_knight.threaded import ThreadedRunner
+
+
+def parse_args(argv=None):
+    """Read command line options"""
+    parser = argparse.ArgumentParser(description="Zombie Knight")
+    parser.add_argument("--map", help="path to a tile map text file (one row per line, comma separated tile ids)")
+    parser.add_argument("--profile", action="store_true", help="profile the main loop and print the slowest calls on exit")
+    parser.add_argument("--server", action="store_true", help="run a headless co-op server")
+    parser.add_argument("--connect", metavar="HOST", help="connect to a co-op server and draw its game")
+    parser.add_argument("--host", default="127.0.0.1", help="address the server listens on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port the server listens on")
+    parser.add_argument("--input-buffer", type=int, default=INPUT_BUFFER_FRAMES, metavar="FRAMES",
+                        help="how many frames a jump or shot waits for the knight to be able to do it")
+    parser.add_argument("--input-latency", action="store_true", help="print input to simulation and input to screen latencies on exit")
+    parser.add_argument("--render-stats", action="store_true", help="print the blits each render layer issued and culled per frame, and particles dropped at the cap, on exit")
+    parser.add_argument("--sleep-stats", action="store_true", help="print how many moving entities were awake and sleeping per frame on exit")
+    parser.add_argument("--audio-stats", action="store_true", help="print music and sound effect load times and memory on exit")
+    parser.add_argument("--hot-reload", action="store_true", help="reload changed images, sounds, fonts and the --map file while playing")
+    parser.add_argument("--threaded", action="store_true", help="simulate on a worker thread while the main thread draws")
+    parser.add_argument("--soak", type=int, metavar="NIGHTS", help="let a bot play this many nights headless and fail if memory or frame times keep rising")
+    parser.add_argument("--soak-threshold", type=float, default=SOAK_THRESHOLD, help="fractional rise that fails the soak test")
+    parser.add_argument("--record", metavar="PATH", help="record the seed and every frame's input to a session file (python -m zombie_knight.replay renders it)")
+    parser.add_argument("--seed", type=int, help="random seed for the game (a recorded game picks one if not given)")
+    parser.add_argument("--telemetry", metavar="PATH", help="log kills, hits, pickups, portal use, nights and frame times to a file")
+    parser.add_argument("--time-startup", action="store_true", help="print how long each startup phase took")
+    return parser.parse_args(argv)
+
+
+def run_game(level, profile=False, inputs=None, reloader=None, recorder=None):
+    """Run the main game loop until the window is closed"""
+    game = level.game
+    inputs = inputs or InputHandler(level.player)
+    clock = pygame.time.Clock()
+
+    game.pause_game("Zombie Knight", "Press 'Enter' to Begin")
+    engine.play_music()
+
+    # Profile the main loop if asked to
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    # Main game loop
+    running = True
+    while running:
+        # Check to see if the user wants to quit
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            inputs.handle_event(event)
+        inputs.poll_keys()
+
+        # Pick up edited assets during development
+        if reloader:
+            reloader.update()
+
+        # Update and draw everything
+        frame_start = time.perf_counter()
+        if recorder:
+            recorder.record(level, inputs)
+        inputs.apply(level.frame_count)
+        level.update()
+        level.draw()
+
+        # Update the display and tick the clock
+        pygame.display.update()
+        inputs.presented(level.frame_count)
+        telemetry.record_frame_time(time.perf_counter() - frame_start)
+        clock.tick(FPS)
+
+    # Print the slowest calls of the main loop
+    if profile:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+def main(argv=None, import_time=0.0):
+    """Start the game in the mode chosen on the command line"""
+    args = parse_args(argv)
+
+    # A headless server (or soak test) has no window or speakers, and stops on a signal like any other process
+    if args.server or args.soak:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+        os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+
+    # Start the pygame subsystems this mode needs
+    phases = [("import", import_time)]
+    start = time.perf_counter()
+    if not args.server:
+        engine.get_display_surface()
+    engine.init_mixer()
+    engine.init_font()
+    phases.append(("init", time.perf_counter() - start))
+
+    # Read every image once
+    start = time.perf_counter()
+    image_count = engine.preload_images()
+    phases.append(("assets", time.perf_counter() - start))
+
+    # A recorded game needs a known seed to play back the same way
+    seed = args.seed
+    if seed is None and args.record:
+        seed = int(time.time())
+    if seed is not None:
+        seed_random(seed)
+
+    # Build the level
+    start = time.perf_counter()
+    level = Level(load_tile_map(args.map) if args.map else DEFAULT_TILE_MAP)
+    phases.append(("level", time.perf_counter() - start))
+
+    if args.time_startup:
+        print(f"Startup ({image_count} images):")
+        for name, seconds in phases:
+            print(f"  {name:<8}{seconds * 1000:8.1f} ms")
+        print(f"  {'total':<8}{sum(seconds for name, seconds in phases) * 1000:8.1f} ms")
+
+    if args.telemetry:
+        telemetry.start_telemetry(args.telemetry)
+
+    # A co-op server runs the game without a window, a client only draws what the server sends
+    passed = True
+    inputs = None
+    if args.server:
+        GameServer(level, args.host, args.port).run()
+    elif args.connect:
+        GameClient(level, args.connect, args.port).run()
+    elif args.soak:
+        passed = SoakTest(level, args.soak, args.soak_threshold).run()
+    elif args.threaded:
+        inputs = InputHandler(level.player, args.input_buffer)
+        ThreadedRunner(level, inputs).run()
+    else:
+        inputs = InputHandler(level.player, args.input_buffer)
+        reloader = HotReloader(level, args.map) if args.hot_reload else None
+        recorder = SessionRecorder(args.record, seed, args.map, args.input_buffer, args.hot_reload) if args.record else None
+        run_game(level, args.profile, inputs, reloader, recorder)
+        if recorder:
+            recorder.close()
+    if args.input_latency and inputs:
+        inputs.report()
+    if args.audio_stats:
+        engine.report_audio()
+    if args.render_stats:
+        level.render_queue.report()
+        level.particle_system.report()
+    if args.sleep_stats:
+        level.systems.report()
+
+    # End the game
+    telemetry.stop_telemetry()
+    pygame.quit()
+    if not passed:
+        sys.exit(1)
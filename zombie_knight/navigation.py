@@ -0,0 +1,123 @@
+"""Zombie navigation: a flow field toward the player compiled from the level's platforms and portals"""
+import pygame
+
+from zombie_knight.settings import FPS, NAVIGATION_UPDATES_PER_SECOND, TILE_SIZE
+from zombie_knight.sprites import get_portal_exit
+
+
+class FlowField():
+    """A class that points every platform tile toward the player so any number of zombies can chase them"""
+
+    def __init__(self, tile_map, portal_group):
+        """Compile the platform layout and portal links of the level into a graph"""
+        self.rows = len(tile_map)
+        self.cols = len(tile_map[0])
+
+        # A node is a platform tile something can stand on, indexed by row * cols + col
+        platform_tiles = set()
+        for i in range(self.rows):
+            for j in range(self.cols):
+                if tile_map[i][j] in (2, 3, 4, 5):
+                    platform_tiles.add((i, j))
+        self.nodes = [i * self.cols + j for i, j in platform_tiles if (i - 1, j) not in platform_tiles]
+        self.node_set = set(self.nodes)
+
+        # Edges are (target node, direction to walk), direction 0 means a portal carries you there
+        self.edges = {node: [] for node in self.nodes}
+        portal_rects = [portal.rect for portal in portal_group]
+        for node in self.nodes:
+            i, j = divmod(node, self.cols)
+
+            # A zombie standing here would touch a portal, so this node always leads through it
+            standing_rect = pygame.Rect(j * TILE_SIZE - 16, i * TILE_SIZE + 1 - 64, 64, 64)
+            if standing_rect.collidelist(portal_rects) != -1:
+                x, y = get_portal_exit(j * TILE_SIZE - 16, i * TILE_SIZE + 1)
+                target = self.node_below(int(y) // TILE_SIZE, int(x + 32) // TILE_SIZE % self.cols)
+                if target is not None:
+                    self.edges[node].append((target, 0))
+                continue
+
+            # Walk onto the next tile or fall off the edge onto the platform below (the world wraps around)
+            for direction in (-1, 1):
+                target = self.node_below(i, (j + direction) % self.cols)
+                if target is not None:
+                    self.edges[node].append((target, direction))
+
+        # Reverse edges are what the search from the player walks along
+        self.reverse_edges = {node: [] for node in self.nodes}
+        for node in self.nodes:
+            for target, direction in self.edges[node]:
+                self.reverse_edges[target].append(node)
+
+        # The flow field itself, one direction per tile (0 keeps walking the current way)
+        self.directions = [0] * (self.rows * self.cols)
+        self.goal = None
+        self.frame_count = 0
+
+    def node_below(self, row, col):
+        """Get the first node at or below a tile, or None if it falls out of the world"""
+        for i in range(max(row, 0), self.rows):
+            if i * self.cols + col in self.node_set:
+                return i * self.cols + col
+        return None
+
+    def node_at(self, rect):
+        """Get the tile index under the feet of a sprite, or None if it is off the map"""
+        i = (rect.bottom - 1) // TILE_SIZE
+        j = rect.centerx // TILE_SIZE
+        if 0 <= i < self.rows and 0 <= j < self.cols:
+            return i * self.cols + j
+        return None
+
+    def update(self, player):
+        """Recompute the flow field toward the player a few times a second"""
+        self.frame_count += 1
+        if self.frame_count % (FPS // NAVIGATION_UPDATES_PER_SECOND) == 0:
+            self.frame_count = 0
+            self.compute(player.rect)
+
+    def compute(self, target_rect):
+        """Search outward from the target and store which way to walk on every node"""
+        node = self.node_at(target_rect)
+        if node is None:
+            return
+        i, j = divmod(node, self.cols)
+        goal = self.node_below(i, j)
+        if goal is None or goal == self.goal:
+            return
+        self.goal = goal
+
+        # Breadth first search from the goal along reversed edges
+        distances = {goal: 0}
+        frontier = [goal]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for source in self.reverse_edges[node]:
+                    if source not in distances:
+                        distances[source] = distances[node] + 1
+                        next_frontier.append(source)
+            frontier = next_frontier
+
+        # Every node walks along its edge that gets closest to the goal
+        directions = [0] * (self.rows * self.cols)
+        for node, distance in distances.items():
+            for target, direction in self.edges[node]:
+                if distances.get(target, distance) < distance:
+                    directions[node] = direction
+                    break
+
+        # Zombies can't climb, so nodes that can't reach the goal just head for the goal's column
+        for node in self.nodes:
+            if node not in distances:
+                offset = (j - node % self.cols) % self.cols
+                if offset:
+                    directions[node] = 1 if offset <= self.cols // 2 else -1
+        self.directions = directions
+
+    def direction_at(self, rect):
+        """Get which way a sprite standing at rect should walk (0 means no change)"""
+        node = self.node_at(rect)
+        if node is None:
+            return 0
+        return self.directions[node]
@@ -0,0 +1,526 @@
+"""Co-op play: a headless server that owns the game and a client that draws its snapshots"""
+import socket
+import struct
+import time
+
+import pygame
+
+from zombie_knight import telemetry
+from zombie_knight.engine import get_display_surface, load_frame
+from zombie_knight.render import (BACKGROUND_LAYER, BULLET_LAYER, PLAYER_LAYER, PORTAL_LAYER, RUBY_LAYER, WORLD_LAYER,
+                                  ZOMBIE_LAYER, RenderQueue, draw_blits)
+from zombie_knight.settings import (CLIENT_TIMEOUT, FPS, INTERPOLATION_DELAY, SNAPSHOT_HISTORY,
+                                    SNAPSHOT_INTERVAL, STATS_INTERVAL)
+from zombie_knight.sprites import Ruby, Zombie
+
+
+#Network packet layouts (network byte order)
+INPUT_PACKET = struct.Struct("!BIIBBB")  # type, input sequence, acked snapshot, held keys, jump count, fire count
+SNAPSHOT_HEADER = struct.Struct("!BIIIhHh")  # type, tick, baseline tick (0 = full), score, health, night, sunrise in
+ENTITY_STATE = struct.Struct("!HBhhBB")  # id, kind, x, y, frame, animation
+COUNT = struct.Struct("!H")
+ENTITY_ID = struct.Struct("!H")
+INPUT_TYPE = 1
+SNAPSHOT_TYPE = 2
+
+#Held key bits sent by a client
+LEFT_BIT = 1
+RIGHT_BIT = 2
+
+#Entity kinds in a snapshot
+PLAYER_KIND = 0
+ZOMBIE_BOY_KIND = 1
+ZOMBIE_GIRL_KIND = 2
+RUBY_KIND = 3
+BULLET_KIND = 4
+
+#The render layer each entity kind is drawn on
+KIND_LAYERS = {PLAYER_KIND: PLAYER_LAYER, ZOMBIE_BOY_KIND: ZOMBIE_LAYER, ZOMBIE_GIRL_KIND: ZOMBIE_LAYER,
+               RUBY_KIND: RUBY_LAYER, BULLET_KIND: BULLET_LAYER}
+
+
+def get_animation(sprite, animations):
+    """Get the (animation index, frame index) of the image a sprite is showing"""
+    for animation, sprite_list in enumerate(animations):
+        for frame, image in enumerate(sprite_list):
+            if image is sprite.image:
+                return animation, frame
+    return 0, 0
+
+
+def player_animations(player):
+    """Get the player's sprite lists in the order snapshots number them"""
+    return (player.idle_right_sprites, player.idle_left_sprites, player.move_right_sprites, player.move_left_sprites,
+            player.jump_right_sprites, player.jump_left_sprites, player.attack_right_sprites, player.attack_left_sprites)
+
+
+def zombie_animations(zombie):
+    """Get a zombie's sprite lists in the order snapshots number them"""
+    return (zombie.walk_right_sprites, zombie.walk_left_sprites, zombie.die_right_sprites,
+            zombie.die_left_sprites, zombie.rise_right_sprites, zombie.rise_left_sprites)
+
+
+def encode_snapshot(tick, baseline_tick, game, entities, baseline):
+    """Pack the entities that changed since the baseline (every entity if there is none)"""
+    if baseline is None:
+        baseline = {}
+        baseline_tick = 0
+
+    changed = [(entity_id, state) for entity_id, state in entities.items() if baseline.get(entity_id) != state]
+    removed = [entity_id for entity_id in baseline if entity_id not in entities]
+
+    packet = [SNAPSHOT_HEADER.pack(SNAPSHOT_TYPE, tick, baseline_tick, game.score, game.player.health,
+                                   game.round_number, game.round_time)]
+    packet.append(COUNT.pack(len(changed)))
+    for entity_id, state in changed:
+        packet.append(ENTITY_STATE.pack(entity_id, *state))
+    packet.append(COUNT.pack(len(removed)))
+    for entity_id in removed:
+        packet.append(ENTITY_ID.pack(entity_id))
+    return b"".join(packet)
+
+
+def decode_snapshot(packet, baselines):
+    """Unpack a snapshot on top of its baseline, returns (tick, hud values, entities) or None if the baseline is gone"""
+    packet_type, tick, baseline_tick, score, health, night, sunrise_in = SNAPSHOT_HEADER.unpack_from(packet)
+    if baseline_tick:
+        if baseline_tick not in baselines:
+            return None
+        entities = dict(baselines[baseline_tick])
+    else:
+        entities = {}
+
+    offset = SNAPSHOT_HEADER.size
+    changed_count, = COUNT.unpack_from(packet, offset)
+    offset += COUNT.size
+    for k in range(changed_count):
+        entity_id, kind, x, y, frame, animation = ENTITY_STATE.unpack_from(packet, offset)
+        entities[entity_id] = (kind, x, y, frame, animation)
+        offset += ENTITY_STATE.size
+
+    removed_count, = COUNT.unpack_from(packet, offset)
+    offset += COUNT.size
+    for k in range(removed_count):
+        entity_id, = ENTITY_ID.unpack_from(packet, offset)
+        entities.pop(entity_id, None)
+        offset += ENTITY_ID.size
+
+    return tick, (score, health, night, sunrise_in), entities
+
+
+class RemoteClient():
+    """A class to hold what the server knows about one connected client"""
+
+    def __init__(self, address):
+        """Initialize the client"""
+        self.address = address
+        self.acked_tick = 0
+        self.last_input_sequence = -1
+        self.jump_count = None
+        self.fire_count = None
+        self.last_heard = time.perf_counter()
+        self.bytes_sent = 0
+
+
+class GameServer():
+    """A class that owns the game simulation and sends snapshots of it to clients over UDP"""
+
+    def __init__(self, level, host, port):
+        """Initialize the server"""
+        self.level = level
+        self.game = level.game
+        self.game.is_headless = True
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+
+        # Clients by address, the first one to connect controls the knight
+        self.clients = {}
+        self.controller = None
+        self.game.player.input_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+
+        # Network ids for sprites and the entity states sent recently (deltas are built against these)
+        self.entity_ids = {}
+        self.next_entity_id = 1
+        self.history = {}
+        self.tick = 0
+
+        # Statistics for the current report
+        self.tick_times = []
+        self.snapshot_sizes = []
+        self.full_snapshots = 0
+        self.report_time = time.perf_counter()
+
+    def run(self):
+        """Step the simulation at a fixed tick and send snapshots until interrupted"""
+        print(f"Zombie Knight server listening on {self.socket.getsockname()}")
+        next_tick = time.perf_counter()
+        try:
+            while True:
+                self.receive_inputs()
+
+                start = time.perf_counter()
+                self.level.update()
+                self.tick += 1
+                if self.tick % SNAPSHOT_INTERVAL == 0:
+                    self.send_snapshots()
+                self.tick_times.append(time.perf_counter() - start)
+                telemetry.record_frame_time(self.tick_times[-1])
+
+                if start - self.report_time >= STATS_INTERVAL:
+                    self.report()
+
+                # Sleep until the next tick, skip ahead if we fell far behind
+                next_tick += 1 / FPS
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -1:
+                    next_tick = time.perf_counter()
+        except KeyboardInterrupt:
+            self.report()
+        finally:
+            self.socket.close()
+
+    def receive_inputs(self):
+        """Read every waiting input packet"""
+        while True:
+            try:
+                packet, address = self.socket.recvfrom(1024)
+            except BlockingIOError:
+                break
+            except ConnectionResetError:
+                continue
+            if len(packet) != INPUT_PACKET.size or packet[0] != INPUT_TYPE:
+                continue
+
+            if address not in self.clients:
+                print(f"Client connected from {address}")
+                self.clients[address] = RemoteClient(address)
+                if self.controller is None:
+                    self.controller = address
+            client = self.clients[address]
+            client.last_heard = time.perf_counter()
+
+            packet_type, sequence, acked_tick, held, jump_count, fire_count = INPUT_PACKET.unpack(packet)
+            client.acked_tick = max(client.acked_tick, acked_tick)
+            if sequence <= client.last_input_sequence:
+                continue
+            client.last_input_sequence = sequence
+
+            # Press counters survive lost packets, every new press since the last packet is applied
+            if address == self.controller:
+                player = self.game.player
+                player.input_keys[pygame.K_LEFT] = bool(held & LEFT_BIT)
+                player.input_keys[pygame.K_RIGHT] = bool(held & RIGHT_BIT)
+                if client.jump_count is not None and jump_count != client.jump_count:
+                    player.jump()
+                if client.fire_count is not None and fire_count != client.fire_count:
+                    player.fire()
+            client.jump_count = jump_count
+            client.fire_count = fire_count
+
+        # Forget clients that have gone quiet
+        now = time.perf_counter()
+        for address in [address for address, client in self.clients.items() if now - client.last_heard > CLIENT_TIMEOUT]:
+            print(f"Client {address} timed out")
+            del self.clients[address]
+            if address == self.controller:
+                self.controller = next(iter(self.clients), None)
+                self.game.player.input_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+
+    def get_entity_id(self, sprite):
+        """Get the network id of a sprite, giving it one the first time it is seen"""
+        if sprite not in self.entity_ids:
+            self.entity_ids[sprite] = self.next_entity_id
+            self.next_entity_id = self.next_entity_id % 65535 + 1
+        return self.entity_ids[sprite]
+
+    def capture_entities(self):
+        """Get the quantized state of every player, zombie, ruby and bullet by network id"""
+        entities = {}
+        live_sprites = set()
+
+        player = self.game.player
+        animation, frame = get_animation(player, player_animations(player))
+        entities[self.get_entity_id(player)] = (PLAYER_KIND, round(player.rect.x), round(player.rect.y), frame, animation)
+        live_sprites.add(player)
+
+        for zombie in self.game.zombie_group:
+            animation, frame = get_animation(zombie, zombie_animations(zombie))
+            kind = ZOMBIE_BOY_KIND if zombie.gender == 0 else ZOMBIE_GIRL_KIND
+            entities[self.get_entity_id(zombie)] = (kind, zombie.rect.x, zombie.rect.y, frame, animation)
+            live_sprites.add(zombie)
+
+        for ruby in self.game.ruby_group:
+            entities[self.get_entity_id(ruby)] = (RUBY_KIND, ruby.rect.x, ruby.rect.y, int(ruby.current_sprite), 0)
+            live_sprites.add(ruby)
+
+        for bullet in self.game.bullet_group:
+            entities[self.get_entity_id(bullet)] = (BULLET_KIND, bullet.rect.x, bullet.rect.y, 0, 0 if bullet.VELOCITY > 0 else 1)
+            live_sprites.add(bullet)
+
+        # Sprites that are gone give their ids up
+        for sprite in [sprite for sprite in self.entity_ids if sprite not in live_sprites]:
+            del self.entity_ids[sprite]
+
+        return entities
+
+    def send_snapshots(self):
+        """Send every client the entities that changed since the last snapshot it acknowledged"""
+        entities = self.capture_entities()
+        self.history[self.tick] = entities
+        for tick in [tick for tick in self.history if tick < self.tick - SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL]:
+            del self.history[tick]
+
+        for client in self.clients.values():
+            baseline = self.history.get(client.acked_tick)
+            packet = encode_snapshot(self.tick, client.acked_tick, self.game, entities, baseline)
+            if baseline is None:
+                self.full_snapshots += 1
+            try:
+                self.socket.sendto(packet, client.address)
+            except OSError:
+                continue
+            client.bytes_sent += len(packet)
+            self.snapshot_sizes.append(len(packet))
+
+    def report(self):
+        """Print tick time and bandwidth statistics since the last report"""
+        now = time.perf_counter()
+        elapsed = now - self.report_time
+        if self.tick_times:
+            tick_times = sorted(self.tick_times)
+            average = sum(tick_times) / len(tick_times) * 1000
+            worst = tick_times[-1] * 1000
+            p95 = tick_times[int(len(tick_times) * 0.95)] * 1000
+            sent = sum(self.snapshot_sizes)
+            average_size = sent / len(self.snapshot_sizes) if self.snapshot_sizes else 0
+            print(f"tick {self.tick}: {len(tick_times) / elapsed:.1f} ticks/s, tick ms avg {average:.2f} p95 {p95:.2f} max {worst:.2f}, "
+                  f"{len(self.clients)} clients, {sent / elapsed / 1024:.2f} KiB/s sent, "
+                  f"snapshot avg {average_size:.0f} B, {self.full_snapshots} full")
+
+        self.tick_times = []
+        self.snapshot_sizes = []
+        self.full_snapshots = 0
+        self.report_time = now
+
+
+class GameClient():
+    """A class that sends keyboard input to a server and draws the snapshots it sends back"""
+
+    def __init__(self, level, host, port):
+        """Initialize the client"""
+        self.game = level.game
+        self.world = level.world
+        self.camera = level.camera
+        self.portal_group = level.portal_group
+        self.systems = level.systems
+        self.server_address = (host, port)
+        self.clock = pygame.time.Clock()
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+        # Images for every entity kind, taken from the game's own sprites
+        player = self.game.player
+        boy = Zombie(1, 1, gender=0)
+        girl = Zombie(1, 1, gender=1)
+        ruby = Ruby()
+        self.images = {
+            PLAYER_KIND: player_animations(player),
+            ZOMBIE_BOY_KIND: zombie_animations(boy),
+            ZOMBIE_GIRL_KIND: zombie_animations(girl),
+            RUBY_KIND: (ruby.ruby_sprites,),
+            BULLET_KIND: ([load_frame("images/player/slash.png", (32, 32))],
+                          [load_frame("images/player/slash.png", (32, 32), True)]),
+        }
+
+        # Snapshots carry every moving entity's frame, the local knight is only kept for its images and the HUD
+        # (taking it out of the groups leaves just the portals and ruby makers for the systems to animate)
+        player.kill()
+
+        # The level and the interpolated entities are drawn from one layered queue, like the game's own
+        self.entity_blits = {layer: [] for layer in set(KIND_LAYERS.values())}
+        self.render_queue = RenderQueue()
+        self.render_queue.add_source(BACKGROUND_LAYER, level.get_background_blits)
+        self.render_queue.add_source(WORLD_LAYER, level.get_world_blits)
+        self.render_queue.add_group(PORTAL_LAYER, self.portal_group)
+        for layer in self.entity_blits:
+            self.render_queue.add_source(layer, self.get_entity_source(layer))
+
+        # Input state, presses are counted so a lost packet never loses a jump
+        self.input_sequence = 0
+        self.jump_count = 0
+        self.fire_count = 0
+
+        # Received snapshots by tick, the newest few are kept for interpolation and as delta baselines
+        self.snapshots = {}
+        self.latest_tick = 0
+        self.render_tick = None
+        self.player_id = None
+
+        # Statistics
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.snapshots_lost = 0
+        self.stats_text = ""
+        self.report_time = time.perf_counter()
+
+    def run(self):
+        """Run the client until the window is closed"""
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        self.jump_count = (self.jump_count + 1) % 256
+                    if event.key == pygame.K_UP:
+                        self.fire_count = (self.fire_count + 1) % 256
+
+            self.send_input()
+            self.receive_snapshots()
+            self.draw()
+            self.update_stats()
+
+            pygame.display.update()
+            self.clock.tick(FPS)
+
+        self.socket.close()
+        print(self.stats_text)
+
+    def send_input(self):
+        """Send the held keys and press counters to the server"""
+        keys = pygame.key.get_pressed()
+        held = (LEFT_BIT if keys[pygame.K_LEFT] else 0) | (RIGHT_BIT if keys[pygame.K_RIGHT] else 0)
+        self.input_sequence += 1
+        packet = INPUT_PACKET.pack(INPUT_TYPE, self.input_sequence, self.latest_tick, held, self.jump_count, self.fire_count)
+        try:
+            self.socket.sendto(packet, self.server_address)
+        except OSError:
+            pass
+
+    def receive_snapshots(self):
+        """Read every waiting snapshot and rebuild it on top of its baseline"""
+        while True:
+            try:
+                packet, address = self.socket.recvfrom(65535)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if not packet or packet[0] != SNAPSHOT_TYPE:
+                continue
+            self.bytes_received += len(packet)
+
+            snapshot = decode_snapshot(packet, {tick: entities for tick, (hud, entities) in self.snapshots.items()})
+            if snapshot is None:
+                continue
+            tick, hud, entities = snapshot
+            if tick <= self.latest_tick:
+                continue
+
+            if self.latest_tick:
+                self.snapshots_lost += max((tick - self.latest_tick) // SNAPSHOT_INTERVAL - 1, 0)
+            self.snapshots_received += 1
+            self.latest_tick = tick
+            self.snapshots[tick] = (hud, entities)
+            for old_tick in [old_tick for old_tick in self.snapshots if old_tick < tick - SNAPSHOT_HISTORY * SNAPSHOT_INTERVAL]:
+                del self.snapshots[old_tick]
+
+            if self.player_id is None:
+                for entity_id, state in entities.items():
+                    if state[0] == PLAYER_KIND:
+                        self.player_id = entity_id
+
+    def interpolate(self):
+        """Get entity states between the two snapshots around the render tick"""
+        # Render a little behind the newest snapshot so there is always one to move toward
+        target_tick = self.latest_tick - INTERPOLATION_DELAY
+        if self.render_tick is None or abs(self.render_tick - target_tick) > INTERPOLATION_DELAY * 2:
+            self.render_tick = target_tick
+        else:
+            self.render_tick += 1 + (target_tick - self.render_tick) * 0.05
+
+        ticks = sorted(self.snapshots)
+        before = [tick for tick in ticks if tick <= self.render_tick]
+        after = [tick for tick in ticks if tick > self.render_tick]
+        if not before:
+            return self.snapshots[ticks[0]][1]
+        if not after:
+            return self.snapshots[before[-1]][1]
+
+        start_entities = self.snapshots[before[-1]][1]
+        end_entities = self.snapshots[after[0]][1]
+        alpha = (self.render_tick - before[-1]) / (after[0] - before[-1])
+
+        entities = {}
+        for entity_id, (kind, x, y, frame, animation) in end_entities.items():
+            start = start_entities.get(entity_id)
+            # Portals and wrap around jump, everything else slides between snapshots
+            if start and abs(start[1] - x) < 128 and abs(start[2] - y) < 128:
+                x = start[1] + (x - start[1]) * alpha
+                y = start[2] + (y - start[2]) * alpha
+                if alpha < 0.5:
+                    frame, animation = start[3], start[4]
+            entities[entity_id] = (kind, x, y, frame, animation)
+        return entities
+
+    def get_entity_source(self, layer):
+        """Get a render queue source that returns the entity blits sorted into a layer this frame"""
+        blits = self.entity_blits[layer]
+        return lambda camera: blits
+
+    def draw(self):
+        """Draw the level and the interpolated entities"""
+        display_surface = get_display_surface()
+        entities = self.interpolate() if self.snapshots else {}
+
+        # The camera follows our knight
+        if self.player_id in entities:
+            kind, x, y, frame, animation = entities[self.player_id]
+            self.camera.follow(pygame.Rect(x, y, 64, 64))
+        self.world.update(self.camera)
+
+        # Only the portals and ruby makers animate here, snapshot entities are drawn on the frame the server sent
+        self.systems.mark_active(self.world.active_rect)
+        self.systems.animate()
+
+        # Sort the visible entities into their layers
+        for blits in self.entity_blits.values():
+            blits.clear()
+        view_rect = self.camera.view_rect
+        for kind, x, y, frame, animation in entities.values():
+            sprite_list = self.images[kind][animation]
+            image = sprite_list[min(frame, len(sprite_list) - 1)]
+            if view_rect.colliderect(pygame.Rect(x, y, image.get_width(), image.get_height())):
+                self.entity_blits[KIND_LAYERS[kind]].append((image, (x - view_rect.x, y - view_rect.y)))
+        draw_blits(display_surface, self.render_queue.build(self.camera))
+        if not self.snapshots:
+            return
+
+        # The HUD shows the newest values from the server
+        score, health, night, sunrise_in = self.snapshots[self.latest_tick][0]
+        self.game.score = score
+        self.game.player.health = health
+        self.game.round_number = night
+        self.game.round_time = sunrise_in
+        self.game.draw()
+
+        stats_image = self.game.HUD_font.render(self.stats_text, True, (255, 255, 255))
+        display_surface.blit(stats_image, (10, 10))
+
+    def update_stats(self):
+        """Recompute the bandwidth and snapshot statistics once a second"""
+        now = time.perf_counter()
+        elapsed = now - self.report_time
+        if elapsed < 1:
+            return
+        behind = self.latest_tick - self.render_tick if self.render_tick is not None else 0
+        self.stats_text = (f"{self.bytes_received / elapsed / 1024:.2f} KiB/s, {self.snapshots_received / elapsed:.0f} snapshots/s, "
+                           f"{self.snapshots_lost} lost, {behind:.1f} ticks behind")
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.snapshots_lost = 0
+        self.report_time = now
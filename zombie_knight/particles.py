@@ -0,0 +1,110 @@
+"""Hit, death and pickup effects kept in NumPy arrays and drawn with one blits call"""
+import numpy as np
+import pygame
+
+from zombie_knight.settings import MAX_PARTICLES, PARTICLE_FRAMES
+
+
+class ParticleSystem():
+    """A class to simulate and draw effect particles in fixed size arrays instead of sprites"""
+
+    def __init__(self, max_particles=MAX_PARTICLES):
+        """Initialize the particle system"""
+        self.max_particles = max_particles
+
+        # Particle data, a lifetime of 0 marks a free slot
+        self.positions = np.zeros((max_particles, 2), np.float32)
+        self.velocities = np.zeros((max_particles, 2), np.float32)
+        self.gravities = np.zeros(max_particles, np.float32)
+        self.lifetimes = np.zeros(max_particles, np.int32)
+        self.starting_lifetimes = np.ones(max_particles, np.int32)
+        self.first_frames = np.zeros(max_particles, np.int32)
+        self.frames = np.zeros(max_particles, np.int32)
+
+        # Effects: (color, particle count, speed, lifetime in frames, gravity)
+        self.effects = {
+            "hit": ((90, 160, 40), 12, 4, 20, 0.4),
+            "death": ((120, 20, 20), 30, 6, 35, 0.5),
+            "player_hit": ((230, 30, 30), 16, 5, 25, 0.4),
+            "pickup": ((255, 60, 120), 20, 3, 30, -0.1),
+        }
+
+        # Every effect shrinks through the same number of frames, all frames share one image list
+        # Each image is drawn up and left by its radius so the particle is centered on its position
+        self.images = []
+        radii = []
+        self.effect_first_frames = {}
+        for name, (color, count, speed, lifetime, gravity) in self.effects.items():
+            self.effect_first_frames[name] = len(self.images)
+            for radius in range(PARTICLE_FRAMES, 0, -1):
+                image = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(image, color, (radius, radius), radius)
+                self.images.append(image)
+                radii.append(radius)
+        self.image_offsets = np.array(radii, np.float32)
+
+        # Counters for --render-stats (particles alive this frame, the most ever alive, and those the cap dropped)
+        self.active_count = 0
+        self.max_active_count = 0
+        self.dropped_count = 0
+
+    def emit(self, effect, x, y):
+        """Start an effect at (x, y), never going over the particle cap"""
+        color, count, speed, lifetime, gravity = self.effects[effect]
+
+        free = np.flatnonzero(self.lifetimes == 0)[:count]
+        self.dropped_count += count - len(free)
+        if not len(free):
+            return
+
+        # Spray the particles out in random directions at random speeds
+        angles = np.random.uniform(0, 2 * np.pi, len(free))
+        speeds = np.random.uniform(speed * 0.25, speed, len(free))
+        self.positions[free] = (x, y)
+        self.velocities[free, 0] = np.cos(angles) * speeds
+        self.velocities[free, 1] = np.sin(angles) * speeds
+        self.gravities[free] = gravity
+        self.lifetimes[free] = np.random.randint(lifetime // 2, lifetime + 1, len(free))
+        self.starting_lifetimes[free] = self.lifetimes[free]
+        self.first_frames[free] = self.effect_first_frames[effect]
+        self.frames[free] = self.first_frames[free]
+
+    def update(self):
+        """Move and age every live particle in one vectorized step"""
+        alive = self.lifetimes > 0
+        self.active_count = int(np.count_nonzero(alive))
+        self.max_active_count = max(self.max_active_count, self.active_count)
+        if not self.active_count:
+            return
+
+        self.velocities[alive, 1] += self.gravities[alive]
+        self.positions[alive] += self.velocities[alive]
+        self.lifetimes[alive] -= 1
+
+        # Particles shrink through their frames as they age
+        age = self.starting_lifetimes[alive] - self.lifetimes[alive]
+        self.frames[alive] = self.first_frames[alive] + age * PARTICLE_FRAMES // self.starting_lifetimes[alive]
+        np.minimum(self.frames, self.first_frames + PARTICLE_FRAMES - 1, out=self.frames)
+
+    def get_blits(self, camera):
+        """Get (image, screen position) pairs for the visible particles"""
+        if not self.active_count:
+            return []
+
+        view_rect = camera.view_rect
+        x = self.positions[:, 0]
+        y = self.positions[:, 1]
+        visible = np.flatnonzero((self.lifetimes > 0) & (x >= view_rect.left) & (x < view_rect.right)
+                                 & (y >= view_rect.top) & (y < view_rect.bottom))
+        if not len(visible):
+            return []
+
+        frames = self.frames[visible]
+        screen_positions = self.positions[visible] - (view_rect.x, view_rect.y) - self.image_offsets[frames][:, np.newaxis]
+        images = self.images
+        return [(images[frame], position) for frame, position in zip(frames.tolist(), screen_positions.astype(np.int32).tolist())]
+
+    def report(self):
+        """Print the most particles alive at once and how many the cap dropped"""
+        print(f"Particles: at most {self.max_active_count} of {self.max_particles} alive, "
+              f"{self.dropped_count} dropped at the cap")
@@ -0,0 +1,111 @@
+"""A render queue: everything a frame shows sorted into fixed layers, culled layer by layer and drawn with one call"""
+import pygame
+
+# Layers, drawn back to front
+BACKGROUND_LAYER = 0
+WORLD_LAYER = 1
+PORTAL_LAYER = 2
+PLAYER_LAYER = 3
+BULLET_LAYER = 4
+ZOMBIE_LAYER = 5
+RUBY_LAYER = 6
+PARTICLE_LAYER = 7
+LAYER_NAMES = ("background", "world", "portals", "player", "bullets", "zombies", "rubies", "particles")
+
+
+def draw_blits(surface, blits):
+    """Draw (image, screen position) pairs with a single call (fblits where the pygame build has it)"""
+    fblits = getattr(surface, "fblits", None)
+    if fblits:
+        fblits(blits)
+    else:
+        surface.blits(blits, False)
+
+
+class RenderQueue():
+    """A class to gather the (image, screen position) pairs of a frame in layer order
+
+    Sprite groups are registered into a layer and culled against the camera
+    there (entity groups only look at the entities filed in the chunks
+    around the view, not every entity they hold), anything else (pre-rendered chunks, particles) registers a
+    function that returns its own visible pairs. A hidden layer is skipped
+    entirely.
+    """
+
+    def __init__(self):
+        """Initialize the render queue"""
+        self.layers = [[] for name in LAYER_NAMES]
+        self.hidden = set()
+
+        # Blits issued and sprites culled by each layer in the last frame, and totals since the start
+        self.layer_counts = [0] * len(LAYER_NAMES)
+        self.culled_counts = [0] * len(LAYER_NAMES)
+        self.total_layer_counts = [0] * len(LAYER_NAMES)
+        self.total_culled_counts = [0] * len(LAYER_NAMES)
+        self.frame_count = 0
+        self.max_blit_count = 0
+
+    def add_group(self, layer, group):
+        """Draw the visible sprites of a group on a layer"""
+        self.layers[layer].append(group)
+
+    def add_source(self, layer, get_blits):
+        """Draw the pairs a function returns for the camera on a layer"""
+        self.layers[layer].append(get_blits)
+
+    def set_visible(self, layer, is_visible):
+        """Show or hide a layer"""
+        if is_visible:
+            self.hidden.discard(layer)
+        else:
+            self.hidden.add(layer)
+
+    def build(self, camera):
+        """Get every visible (image, screen position) pair for the frame, back to front"""
+        view_rect = camera.view_rect
+        is_visible = view_rect.colliderect
+        view_x = view_rect.x
+        view_y = view_rect.y
+
+        # Entities filed near the view, looked up once per set of systems
+        nearby = {}
+
+        blits = []
+        for layer, sources in enumerate(self.layers):
+            start = len(blits)
+            culled = 0
+            if layer not in self.hidden:
+                for source in sources:
+                    if isinstance(source, pygame.sprite.AbstractGroup):
+                        sprites = source
+                        systems = getattr(source, "systems", None)
+                        if systems:
+                            if systems not in nearby:
+                                nearby[systems] = systems.get_entities_near(view_rect)
+                            sprites = [entity for entity in nearby[systems] if entity in source]
+                        for sprite in sprites:
+                            rect = sprite.rect
+                            if is_visible(rect):
+                                blits.append((sprite.image, (rect.x - view_x, rect.y - view_y)))
+                            else:
+                                culled += 1
+                    else:
+                        blits.extend(source(camera))
+            self.layer_counts[layer] = len(blits) - start
+            self.culled_counts[layer] = culled
+            self.total_layer_counts[layer] += len(blits) - start
+            self.total_culled_counts[layer] += culled
+
+        self.frame_count += 1
+        self.max_blit_count = max(self.max_blit_count, len(blits))
+        return blits
+
+    def report(self):
+        """Print the average blits issued and sprites culled per frame by each layer"""
+        if not self.frame_count:
+            return
+        frames = self.frame_count
+        print(f"Render: {frames} frames, {sum(self.total_layer_counts) / frames:.1f} blits per frame in one call "
+              f"(max {self.max_blit_count})")
+        for name, count, culled in zip(LAYER_NAMES, self.total_layer_counts, self.total_culled_counts):
+            print(f"  {name:<12}{count / frames:8.1f} drawn {culled / frames:8.1f} culled")
@@ -0,0 +1,251 @@
+"""Recorded sessions, and an offline renderer that plays them back into image files on several processes at once
+
+A session file starts with MAGIC, the random seed, the settings that
+change how the game plays (--input-buffer, and if --hot-reload was on) and
+the --map path. It then holds one FRAME_RECORD per simulated frame. Every
+SESSION_CHECKPOINT_INTERVAL frames it also holds a CHECKPOINT_RECORD
+followed by a save state of the whole game. The game only depends on the
+seed, those settings and the input, so playing the records back builds
+the same game again.
+
+The renderer splits a session into segments that start at checkpoints,
+one process per segment. A worker loads the save state of its first frame
+instead of simulating every frame before it, then checks the checkpoint
+digest, so a save state that doesn't load back into the same game fails
+instead of rendering the wrong one. Render a session with
+    python -m zombie_knight.replay session.zks frames/ --workers 4
+"""
+import argparse
+import os
+import random
+import shutil
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pygame
+
+from zombie_knight import engine
+from zombie_knight.inputs import FIRE, JUMP, InputHandler
+from zombie_knight.level import DEFAULT_TILE_MAP, Level, load_tile_map
+from zombie_knight.savestate import load_state, save_state
+from zombie_knight.settings import FPS, INPUT_BUFFER_FRAMES, RENDER_SEGMENTS_PER_WORKER, SESSION_CHECKPOINT_INTERVAL
+
+MAGIC = b"ZKS3"
+
+# Random seed, input buffer frames, setting flags, and the length of the --map path that follows (0 for the default level)
+HEADER = struct.Struct("<QHBH")
+
+# Record kind, then held keys, jump presses and fire presses / the frame, a digest of the game state and the save state's length
+FRAME_RECORD = struct.Struct("<BBBB")
+CHECKPOINT_RECORD = struct.Struct("<BIII")
+FRAME = 0
+CHECKPOINT = 1
+
+# Held key bits
+LEFT_KEY = 1
+RIGHT_KEY = 2
+
+# Setting flag bits
+HOT_RELOAD_FLAG = 1
+
+#Everything in a session file before the first record
+SessionHeader = namedtuple("SessionHeader", ["seed", "input_buffer", "flags", "map_path"])
+
+
+def seed_random(seed):
+    """Seed every random number generator the game uses"""
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+
+
+def get_state_digest(level):
+    """Get a checksum of the state a checkpoint checks"""
+    game = level.game
+    player = level.player
+    state = (level.frame_count, game.score, game.round_number, game.round_time, player.health,
+             round(player.position.x, 2), round(player.position.y, 2),
+             sorted((zombie.rect.x, zombie.rect.y, zombie.is_dead) for zombie in level.zombie_group),
+             sorted(ruby.rect.topleft for ruby in level.ruby_group))
+    return zlib.crc32(repr(state).encode())
+
+
+class SessionRecorder():
+    """A class to write the seed, the settings and every frame's input of a game to a session file"""
+
+    def __init__(self, path, seed, map_path=None, input_buffer=INPUT_BUFFER_FRAMES, is_hot_reload=False):
+        """Initialize the recorder"""
+        map_bytes = (map_path or "").encode()
+        flags = HOT_RELOAD_FLAG if is_hot_reload else 0
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.file.write(HEADER.pack(seed, input_buffer, flags, len(map_bytes)))
+        self.file.write(map_bytes)
+        self.frame_count = 0
+
+    def record(self, level, inputs):
+        """Write the keys held and pressed for the frame the level is about to simulate"""
+        frame = level.frame_count
+        if frame % SESSION_CHECKPOINT_INTERVAL == 0:
+            state = save_state(level, inputs)
+            self.file.write(CHECKPOINT_RECORD.pack(CHECKPOINT, frame, get_state_digest(level), len(state)))
+            self.file.write(state)
+
+        keys = level.player.input_keys
+        held = (LEFT_KEY if keys[pygame.K_LEFT] else 0) | (RIGHT_KEY if keys[pygame.K_RIGHT] else 0)
+        actions = [action for action, pressed_time in inputs.pressed]
+        self.file.write(FRAME_RECORD.pack(FRAME, held, actions.count(JUMP), actions.count(FIRE)))
+        self.frame_count += 1
+
+    def close(self):
+        """Finish the session file"""
+        self.file.close()
+        print(f"Recorded {self.frame_count} frames")
+
+
+def read_session(path):
+    """Read a session file into (header, frame records, checkpoint (digest, save state) by frame)"""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recorded by this version of the game")
+        seed, input_buffer, flags, map_length = HEADER.unpack(file.read(HEADER.size))
+        header = SessionHeader(seed, input_buffer, flags, file.read(map_length).decode() or None)
+
+        frames = []
+        checkpoints = {}
+        while True:
+            kind = file.read(1)
+            if not kind:
+                break
+            if kind[0] == FRAME:
+                frames.append(FRAME_RECORD.unpack(kind + file.read(FRAME_RECORD.size - 1))[1:])
+            elif kind[0] == CHECKPOINT:
+                frame, digest, state_length = CHECKPOINT_RECORD.unpack(kind + file.read(CHECKPOINT_RECORD.size - 1))[1:]
+                checkpoints[frame] = (digest, file.read(state_length))
+            else:
+                raise ValueError(f"{path} has an unknown record kind {kind[0]}")
+    return header, frames, checkpoints
+
+
+def build_level(header):
+    """Build the level a session was recorded on, seeded and set up the same way"""
+    seed_random(header.seed)
+    level = Level(load_tile_map(header.map_path) if header.map_path else DEFAULT_TILE_MAP)
+    level.game.is_headless = True
+    return level, InputHandler(level.player, header.input_buffer)
+
+
+def play_frame(level, inputs, frame_record):
+    """Simulate one frame with the recorded input"""
+    held, jumps, fires = frame_record
+    level.player.input_keys = {pygame.K_LEFT: bool(held & LEFT_KEY), pygame.K_RIGHT: bool(held & RIGHT_KEY)}
+    for i in range(jumps):
+        inputs.press(JUMP)
+    for i in range(fires):
+        inputs.press(FIRE)
+    inputs.apply(level.frame_count)
+    level.update()
+
+
+def get_segments(frame_count, checkpoints, segment_count):
+    """Split the frames into about segment_count (start, end) ranges that each start at a checkpoint"""
+    starts = sorted(frame for frame in checkpoints if frame < frame_count) or [0]
+    step = max(1, len(starts) // segment_count)
+    starts = starts[::step]
+    return list(zip(starts, starts[1:] + [frame_count]))
+
+
+def render_segment(path, index, start, end, out_dir, image_format):
+    """Load the save state at start, then play, draw and save frames start to end (runs in a worker process)"""
+    engine.get_display_surface()
+    engine.init_mixer()
+    engine.init_font()
+
+    header, frames, checkpoints = read_session(path)
+    level, inputs = build_level(header)
+
+    # Jump to the checkpoint the segment starts at
+    seek_start = time.perf_counter()
+    digest, state = checkpoints[start]
+    load_state(level, inputs, state)
+    if get_state_digest(level) != digest:
+        raise ValueError(f"{path} no longer plays back the same way (checkpoint at frame {start} differs)")
+    seek_time = time.perf_counter() - seek_start
+
+    render_start = time.perf_counter()
+    display_surface = engine.get_display_surface()
+    raw_file = open(os.path.join(out_dir, f"segment_{index:04d}.rgb"), "wb") if image_format == "raw" else None
+    try:
+        for frame in range(start, end):
+            play_frame(level, inputs, frames[frame])
+            level.draw()
+            if raw_file:
+                raw_file.write(pygame.image.tobytes(display_surface, "RGB"))
+            else:
+                pygame.image.save(display_surface, os.path.join(out_dir, f"frame_{frame:06d}.png"))
+    finally:
+        if raw_file:
+            raw_file.close()
+    return index, end - start, seek_time, time.perf_counter() - render_start
+
+
+def render_session(path, out_dir, workers=None, image_format="png"):
+    """Render every frame of a session into out_dir across a pool of processes and report the throughput"""
+    # Workers draw into an offscreen window and play no sound
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.makedirs(out_dir, exist_ok=True)
+
+    header, frames, checkpoints = read_session(path)
+    if header.flags & HOT_RELOAD_FLAG:
+        print("Recorded with --hot-reload: files edited while playing are not in the session, a checkpoint may differ")
+    workers = workers or os.cpu_count() or 1
+    segments = get_segments(len(frames), checkpoints, workers * RENDER_SEGMENTS_PER_WORKER)
+    print(f"Rendering {len(frames)} frames ({len(frames) / FPS:.1f} s of play) in {len(segments)} segments on {workers} workers")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(render_segment, path, index, segment_start, segment_end, out_dir, image_format)
+                   for index, (segment_start, segment_end) in enumerate(segments)]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    # Raw segments are stitched into one file in frame order, PNGs are already numbered by frame
+    if image_format == "raw":
+        with open(os.path.join(out_dir, "frames.rgb"), "wb") as frames_file:
+            for index in range(len(segments)):
+                segment_path = os.path.join(out_dir, f"segment_{index:04d}.rgb")
+                with open(segment_path, "rb") as segment_file:
+                    shutil.copyfileobj(segment_file, frames_file)
+                os.remove(segment_path)
+
+    frame_count = sum(result[1] for result in results)
+    print(f"Rendered {frame_count} frames in {elapsed:.1f} s: {frame_count / elapsed:.1f} fps, "
+          f"{frame_count / elapsed / FPS:.1f}x real time")
+    for index, count, seek_time, render_time in results:
+        print(f"  segment {index:3d}: {count:6d} frames, seek {seek_time:6.2f} s, render {count / render_time:7.1f} fps")
+    return frame_count
+
+
+def main(argv=None):
+    """Render a session from the command line"""
+    parser = argparse.ArgumentParser(description="Render a recorded Zombie Knight session to image files")
+    parser.add_argument("session", help="a session file written with --record")
+    parser.add_argument("out_dir", help="folder for the frames")
+    parser.add_argument("--workers", type=int, help="processes to render with (default: one per CPU)")
+    parser.add_argument("--format", choices=("png", "raw"), default="png",
+                        help="one PNG per frame, or every frame as raw RGB in one frames.rgb file")
+    args = parser.parse_args(argv)
+    try:
+        render_session(args.session, args.out_dir, args.workers, args.format)
+    except ValueError as error:
+        print(error)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""Save states: the whole simulation at one frame as plain data, so a level built from scratch can carry on from it
+
+A save state holds the random generators, the game counters and the
+scheduler's timers, the camera and the loaded chunks, every entity's
+transform, velocity, animation, flags and image, the flow field, the live
+particles and the presses the input handler is still holding. Loading one
+rebuilds the zombies, rubies and bullets and sets every value back, so it
+only loads into a fresh level built from the same tile map. Animations
+and callbacks are saved by the name of the entity attribute holding them,
+images by the file load_frame made them from, and timers by the name of
+the method they call on the game or on a zombie (by its place in the
+zombie group).
+"""
+import json
+import random
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+from zombie_knight.engine import get_frame_key, load_frame
+from zombie_knight.sprites import Bullet, Ruby, Zombie
+
+#Entity attributes the save state sets through sleep() or the systems instead of directly
+SKIPPED_FLAGS = ("is_active", "is_sleeping")
+
+
+def get_attribute_name(entity, value):
+    """Get the name of the entity attribute holding value (a frame list or a bound method)"""
+    for name, attribute in vars(entity).items():
+        if attribute is value:
+            return name
+    if getattr(value, "__self__", None) is entity:
+        return value.__name__
+    raise ValueError(f"{type(entity).__name__} has no attribute holding {value!r}")
+
+
+def get_entity_state(entity):
+    """Get an entity's components, flags and image as plain data"""
+    components = entity.components
+    transform = components["transform"]
+    state = {
+        "position": list(transform.position),
+        "rect": list(transform.rect),
+        "previous_rect": list(transform.previous_rect),
+        "image": get_frame_key(entity.image),
+        "disabled": sorted(entity.disabled.difference(entity.sleeping_components)),
+        "is_sleeping": entity.is_sleeping,
+        "flags": {name: value for name, value in vars(entity).items()
+                  if type(value) in (bool, int, float) and name not in SKIPPED_FLAGS},
+    }
+    if hasattr(entity, "swept_rect"):
+        state["swept_rect"] = list(entity.swept_rect)
+    if "velocity" in components:
+        state["velocity"] = list(components["velocity"].velocity)
+    if "gravity" in components:
+        state["acceleration"] = list(components["gravity"].acceleration)
+    if "animation" in components:
+        animation = components["animation"]
+        on_end = get_attribute_name(entity, animation.on_end) if animation.on_end else None
+        state["animation"] = [get_attribute_name(entity, animation.frames), animation.frame, animation.speed, on_end]
+    if "chaser" in components:
+        state["direction"] = components["chaser"].direction
+    if "sleeper" in components:
+        state["still_frames"] = components["sleeper"].still_frames
+    if "projectile" in components:
+        state["projectile"] = [components["projectile"].starting_x, components["projectile"].range]
+    return state
+
+
+def set_entity_state(entity, state):
+    """Set an entity (already in its group) back to a state from get_entity_state"""
+    components = entity.components
+    for name, value in state["flags"].items():
+        setattr(entity, name, value)
+
+    transform = components["transform"]
+    transform.rect.update(state["rect"])
+    transform.previous_rect = pygame.Rect(state["previous_rect"])
+    entity.position = state["position"]
+    if state["image"]:
+        path, size, flip = state["image"]
+        entity.image = load_frame(path, tuple(size), flip)
+    if "swept_rect" in state:
+        entity.swept_rect = pygame.Rect(state["swept_rect"])
+
+    if "velocity" in state:
+        components["velocity"].velocity.update(state["velocity"])
+    if "acceleration" in state:
+        components["gravity"].acceleration.update(state["acceleration"])
+    if "animation" in state:
+        frames_name, frame, speed, on_end = state["animation"]
+        animation = components["animation"]
+        animation.frames = getattr(entity, frames_name)
+        animation.frame = frame
+        animation.speed = speed
+        animation.on_end = getattr(entity, on_end) if on_end else None
+    if "direction" in state:
+        components["chaser"].direction = state["direction"]
+    if "projectile" in state:
+        components["projectile"].starting_x, components["projectile"].range = state["projectile"]
+
+    for name in state["disabled"]:
+        entity.disable_component(name)
+    if state["is_sleeping"]:
+        entity.sleep()
+    if "still_frames" in state:
+        components["sleeper"].still_frames = state["still_frames"]
+
+
+def save_state(level, inputs):
+    """Get everything the simulation needs to carry on from this frame, compressed"""
+    game = level.game
+    player = level.player
+    zombies = list(level.zombie_group)
+
+    # Timers call a method of the game or of a zombie
+    timers = []
+    timer_indexes = {}
+    for timer in game.scheduler.get_timers():
+        owner = timer.callback.__self__
+        owner_index = None if owner is game else zombies.index(owner)
+        timer_indexes[timer] = len(timers)
+        timers.append([timer.frame, owner_index, timer.callback.__name__, list(timer.args)])
+
+    zombie_states = []
+    for zombie in zombies:
+        zombie_state = get_entity_state(zombie)
+        zombie_state["rise_timer"] = timer_indexes.get(zombie.rise_timer)
+        zombie_states.append(zombie_state)
+
+    particles = level.particle_system
+    alive = np.flatnonzero(particles.lifetimes > 0)
+    flow_field = level.flow_field
+    world = level.world
+    python_state = random.getstate()
+    numpy_state = np.random.get_state()
+
+    state = {
+        "random": [python_state[0], list(python_state[1]), python_state[2]],
+        "numpy_random": [numpy_state[0], numpy_state[1].tolist(), *numpy_state[2:]],
+        "frame_count": level.frame_count,
+        "game": [game.score, game.round_number, game.round_time, game.zombie_creation_time, game.is_paused],
+        "scheduler_frame": game.scheduler.frame,
+        "timers": timers,
+        "camera": list(level.camera.view_rect),
+        "chunks": [[list(key), [get_entity_state(sprite) for sprite in chunk.animated_group]]
+                   for key, chunk in world.chunks.items()],
+        "active_rect": list(world.active_rect),
+        "player": get_entity_state(player),
+        "portals": [get_entity_state(portal) for portal in level.portal_group],
+        "zombies": zombie_states,
+        "rubies": [get_entity_state(ruby) for ruby in level.ruby_group],
+        "bullets": [get_entity_state(bullet) for bullet in level.bullet_group],
+        "flow_field": [flow_field.goal, flow_field.frame_count, flow_field.directions],
+        "particles": {
+            "alive": alive.tolist(),
+            "positions": particles.positions[alive].tolist(),
+            "velocities": particles.velocities[alive].tolist(),
+            "gravities": particles.gravities[alive].tolist(),
+            "lifetimes": particles.lifetimes[alive].tolist(),
+            "starting_lifetimes": particles.starting_lifetimes[alive].tolist(),
+            "first_frames": particles.first_frames[alive].tolist(),
+            "frames": particles.frames[alive].tolist(),
+            "counts": [particles.active_count, particles.max_active_count, particles.dropped_count],
+        },
+        "pending_inputs": [[action, frames_waited] for action, pressed_time, frames_waited in inputs.pending],
+    }
+    return zlib.compress(json.dumps(state, separators=(",", ":")).encode())
+
+
+def load_state(level, inputs, data):
+    """Put a fresh level built from the same tile map into a state from save_state"""
+    state = json.loads(zlib.decompress(data))
+    game = level.game
+    player = level.player
+
+    level.frame_count = state["frame_count"]
+    game.score, game.round_number, game.round_time, game.zombie_creation_time, game.is_paused = state["game"]
+
+    # The chunks are loaded in the order they were, so the platforms are tested in the same order
+    world = level.world
+    level.camera.view_rect.update(state["camera"])
+    for key in list(world.chunks):
+        world.unload_chunk(*key)
+    for key, sprite_states in state["chunks"]:
+        world.load_chunk(*key)
+        for sprite, sprite_state in zip(world.chunks[tuple(key)].animated_group, sprite_states):
+            set_entity_state(sprite, sprite_state)
+    world.active_rect.update(state["active_rect"])
+
+    set_entity_state(player, state["player"])
+    for portal, portal_state in zip(level.portal_group, state["portals"]):
+        set_entity_state(portal, portal_state)
+
+    # Entities are rebuilt in group order (their constructors use the random generators, which are set last)
+    zombies = []
+    for zombie_state in state["zombies"]:
+        zombie = Zombie(1, 1, zombie_state["flags"]["gender"])
+        level.zombie_group.add(zombie)
+        set_entity_state(zombie, zombie_state)
+        zombies.append(zombie)
+    for ruby_state in state["rubies"]:
+        ruby = Ruby()
+        level.ruby_group.add(ruby)
+        set_entity_state(ruby, ruby_state)
+    for bullet_state in state["bullets"]:
+        set_entity_state(Bullet(0, 0, level.bullet_group, player), bullet_state)
+
+    scheduler = game.scheduler
+    scheduler.clear()
+    scheduler.frame = state["scheduler_frame"]
+    timers = []
+    for frame, owner_index, name, args in state["timers"]:
+        owner = game if owner_index is None else zombies[owner_index]
+        timers.append(scheduler.schedule_at(frame, getattr(owner, name), *args))
+    for zombie, zombie_state in zip(zombies, state["zombies"]):
+        if zombie_state["rise_timer"] is not None:
+            zombie.rise_timer = timers[zombie_state["rise_timer"]]
+
+    flow_field = level.flow_field
+    flow_field.goal, flow_field.frame_count, flow_field.directions = state["flow_field"]
+
+    particles = level.particle_system
+    saved_particles = state["particles"]
+    particles.lifetimes[:] = 0
+    alive = np.array(saved_particles["alive"], np.intp)
+    if len(alive):
+        for name in ("positions", "velocities", "gravities", "lifetimes", "starting_lifetimes", "first_frames", "frames"):
+            array = getattr(particles, name)
+            array[alive] = np.array(saved_particles[name], array.dtype)
+    particles.active_count, particles.max_active_count, particles.dropped_count = saved_particles["counts"]
+
+    inputs.pending = [[action, time.perf_counter(), frames_waited] for action, frames_waited in state["pending_inputs"]]
+
+    version, internal_state, gauss = state["random"]
+    random.setstate((version, tuple(internal_state), gauss))
+    name, keys, position, has_gauss, cached_gaussian = state["numpy_random"]
+    np.random.set_state((name, np.array(keys, np.uint32), position, has_gauss, cached_gaussian))
@@ -0,0 +1,80 @@
+"""A timer wheel for things that happen a number of frames from now (zombie spawns, rises, the sunrise clock)"""
+from zombie_knight.settings import TIMER_WHEEL_SIZE
+
+
+class Timer():
+    """An event waiting in the scheduler"""
+
+    __slots__ = ("frame", "callback", "args", "is_cancelled")
+
+    def __init__(self, frame, callback, args):
+        """Initialize the timer"""
+        self.frame = frame
+        self.callback = callback
+        self.args = args
+        self.is_cancelled = False
+
+    def cancel(self):
+        """Stop the event from firing"""
+        self.is_cancelled = True
+
+
+class Scheduler():
+    """A class to fire events on the frame they are due without checking them every frame
+
+    Each event waits in the wheel slot for the frame it fires on, so a tick
+    only looks at one slot. Events further away than the wheel is long wait
+    for it to come round again.
+    """
+
+    def __init__(self, size=TIMER_WHEEL_SIZE):
+        """Initialize the scheduler"""
+        self.frame = 0
+        self.slots = [[] for i in range(size)]
+        self.due_timers = []
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) delay frames from now and return its timer"""
+        return self.schedule_at(self.frame + max(1, delay), callback, *args)
+
+    def schedule_at(self, frame, callback, *args):
+        """Call callback(*args) on a later frame and return its timer"""
+        timer = Timer(frame, callback, args)
+        self.slots[frame % len(self.slots)].append(timer)
+        return timer
+
+    def get_timers(self):
+        """Get every waiting event that isn't cancelled, in the order the wheel holds them"""
+        return [timer for slot in self.slots for timer in slot if not timer.is_cancelled]
+
+    def tick(self):
+        """Move forward one frame and fire every event due on it"""
+        self.frame += 1
+        index = self.frame % len(self.slots)
+        slot = self.slots[index]
+        if not slot:
+            return
+
+        # Keep the events that are a lap or more of the wheel away
+        waiting = []
+        self.due_timers = []
+        for timer in slot:
+            if timer.frame == self.frame:
+                self.due_timers.append(timer)
+            else:
+                waiting.append(timer)
+        self.slots[index] = waiting
+
+        for timer in self.due_timers:
+            if not timer.is_cancelled:
+                timer.callback(*timer.args)
+        self.due_timers = []
+
+    def clear(self):
+        """Cancel every waiting event"""
+        for timer in self.due_timers:
+            timer.cancel()
+        for slot in self.slots:
+            for timer in slot:
+                timer.cancel()
+            slot.clear()
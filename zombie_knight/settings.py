@@ -0,0 +1,70 @@
+"""Game wide constants (importing this module has no side effects)"""
+
+#Set window size (tile size is 32x32 so 1280/32 = 40 tiles wide, 736/32 = 23 tiles high)
+WINDOW_WIDTH = 1280
+WINDOW_HEIGHT = 736
+
+#Set the world size (the world can be many screens wide and tall, it is set once the tile map is read)
+#Modules read these through the settings module so they see the size of the current level
+TILE_SIZE = 32
+WORLD_WIDTH = WINDOW_WIDTH
+WORLD_HEIGHT = WINDOW_HEIGHT
+
+#Set chunk size (16x16 tiles = 512x512 pixels) and how many chunks past the view stay loaded
+CHUNK_SIZE = 16
+CHUNK_LOAD_RADIUS = 1
+
+#Set how many frames a sleeper has to stand still before it sleeps
+SLEEP_REST_FRAMES = 2
+
+#Set FPS
+FPS = 60
+
+#Set how many times a second the zombies' path to the player is recomputed
+NAVIGATION_UPDATES_PER_SECOND = 4
+
+#Set how many frames the timer wheel holds (events further away wait for it to come round)
+TIMER_WHEEL_SIZE = 256
+
+#Set the most effect particles alive at once and how many frames each shrinks through
+MAX_PARTICLES = 2048
+PARTICLE_FRAMES = 4
+
+#Set how many frames a jump or shot waits for the player to be able to do it, and how many latencies are kept for a report
+INPUT_BUFFER_FRAMES = 6
+INPUT_LATENCY_SAMPLES = 1000
+
+#Set the most memory decoded sound effects may use before the least recently played are dropped
+SOUND_CACHE_BYTES = 4 * 1024 * 1024
+
+#Set the folders a development run watches for changed assets and how often it looks, in seconds
+HOT_RELOAD_DIRECTORIES = ("images", "sounds", "fonts")
+HOT_RELOAD_INTERVAL = 1
+
+#Set co-op networking values (a snapshot goes out every few ticks and clients draw a few ticks in the past)
+DEFAULT_PORT = 5555
+SNAPSHOT_INTERVAL = 3
+SNAPSHOT_HISTORY = 32
+INTERPOLATION_DELAY = 6
+CLIENT_TIMEOUT = 5
+STATS_INTERVAL = 5
+
+#Set how many telemetry events are buffered before a batch is written, and the longest a quiet game waits for a write
+TELEMETRY_BUFFER_EVENTS = 4096
+TELEMETRY_FLUSH_INTERVAL = 5
+
+#Set how many frames apart a recorded session checks the game state, and how many segments each offline render worker gets
+SESSION_CHECKPOINT_INTERVAL = 600
+RENDER_SEGMENTS_PER_WORKER = 2
+
+#Set the soak test's allowed rise in a metric between its early and late nights, and the nights ignored while caches fill
+SOAK_THRESHOLD = 0.25
+SOAK_WARMUP_NIGHTS = 2
+SOAK_DRAW_INTERVAL = 10
+
+
+def set_world_size(width, height):
+    """Set the size of the current level in pixels"""
+    global WORLD_WIDTH, WORLD_HEIGHT
+    WORLD_WIDTH = width
+    WORLD_HEIGHT = height
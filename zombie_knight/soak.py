@@ -0,0 +1,199 @@
+"""Headless soak test: a scripted bot plays many nights while memory, object counts and frame times are watched"""
+import gc
+import os
+import random
+import time
+from collections import Counter
+
+import pygame
+
+from zombie_knight import engine
+from zombie_knight.settings import SOAK_DRAW_INTERVAL, SOAK_THRESHOLD, SOAK_WARMUP_NIGHTS
+
+# Smallest rise at the end of a soak that can count as a leak or slowdown (noise is ignored below these)
+RSS_FLOOR = 4 * 1024 * 1024
+COUNT_FLOOR = 20
+FRAME_TIME_FLOOR = 0.0005
+
+
+def get_rss():
+    """Get the resident memory of this process in bytes (peak memory where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def count_objects():
+    """Count live Python objects by class, plus Surfaces and Sounds (which the garbage collector doesn't track)"""
+    gc.collect()
+    objects = gc.get_objects()
+    counts = Counter(type(obj).__name__ for obj in objects)
+
+    # Surfaces and Sounds are found through the objects that hold them
+    held = {}
+    for obj in gc.get_referents(*objects):
+        if isinstance(obj, (pygame.Surface, pygame.mixer.Sound)):
+            held[id(obj)] = obj
+
+    # The garbage collector can't reach the Sounds in the engine's cache, so they are counted from it
+    for sound in engine.get_decoded_sounds():
+        held[id(sound)] = sound
+    counts["Surface"] = sum(1 for obj in held.values() if isinstance(obj, pygame.Surface))
+    counts["Sound"] = len(held) - counts["Surface"]
+    del objects, held
+    return counts
+
+
+def percentile(sorted_values, fraction):
+    """Get a percentile of an already sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class SoakBot():
+    """A simple scripted player: shoots live zombies, kicks dead ones and picks up rubies"""
+
+    def __init__(self, player, zombie_group, ruby_group, seed=0):
+        """Initialize the bot"""
+        self.player = player
+        self.zombie_group = zombie_group
+        self.ruby_group = ruby_group
+        self.random = random.Random(seed)
+        self.player.input_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        self.frame_count = 0
+
+    def update(self):
+        """Press the keys for this frame"""
+        self.frame_count += 1
+        keys = self.player.input_keys
+        keys[pygame.K_LEFT] = keys[pygame.K_RIGHT] = False
+
+        # Go for the closest dead zombie or ruby, otherwise face the closest live zombie
+        x, y = self.player.rect.center
+        targets = [sprite for sprite in self.zombie_group if sprite.is_dead] + self.ruby_group.sprites()
+        is_fighting = not targets
+        if is_fighting:
+            targets = self.zombie_group.sprites()
+        if targets:
+            target = min(targets, key=lambda sprite: abs(sprite.rect.centerx - x) + abs(sprite.rect.centery - y))
+            if target.rect.centerx < x - 8:
+                keys[pygame.K_LEFT] = True
+            elif target.rect.centerx > x + 8:
+                keys[pygame.K_RIGHT] = True
+
+            if is_fighting and abs(target.rect.centery - y) < 64 and self.frame_count % 12 == 0:
+                self.player.fire()
+            if target.rect.bottom < self.player.rect.top and self.random.random() < 0.05:
+                self.player.jump()
+        elif self.random.random() < 0.01:
+            self.player.jump()
+
+
+class SoakTest():
+    """A class that runs a level headless for many nights and looks for metrics that keep rising"""
+
+    def __init__(self, level, nights, threshold=SOAK_THRESHOLD, seed=0):
+        """Initialize the soak test"""
+        self.level = level
+        self.game = level.game
+        self.game.is_headless = True
+        self.nights = nights
+        self.threshold = threshold
+        self.bot = SoakBot(level.player, level.zombie_group, level.ruby_group, seed)
+
+        # One dictionary of metrics per night
+        self.samples = []
+        self.update_times = []
+        self.draw_times = []
+
+    def run(self):
+        """Play until enough nights have passed, print a report and return True if nothing trended upward"""
+        print(f"Soak test: {self.nights} nights")
+        simulated_frames = 0
+        start = time.perf_counter()
+        last_round_time = self.game.round_time
+
+        while len(self.samples) < self.nights:
+            frame_start = time.perf_counter()
+            self.bot.update()
+            self.level.update()
+            self.update_times.append(time.perf_counter() - frame_start)
+            simulated_frames += 1
+
+            # Drawing every frame would make each night take as long as playing it, a few frames a second still catch drawing leaks
+            if simulated_frames % SOAK_DRAW_INTERVAL == 0:
+                draw_start = time.perf_counter()
+                self.level.draw()
+                self.draw_times.append(time.perf_counter() - draw_start)
+
+            # The sunrise clock only goes back up when a new night (or a new game) starts
+            if self.game.round_time > last_round_time:
+                self.sample()
+            last_round_time = self.game.round_time
+
+        hours = simulated_frames / 60 / 3600
+        print(f"Simulated {hours:.2f} hours in {time.perf_counter() - start:.0f} s")
+        return self.report()
+
+    def sample(self):
+        """Record this night's metrics"""
+        update_times = sorted(self.update_times)
+        draw_times = sorted(self.draw_times) or [0]
+        self.update_times = []
+        self.draw_times = []
+        counts = count_objects()
+
+        metrics = {
+            "rss": get_rss(),
+            "update p50": percentile(update_times, 0.5),
+            "update p95": percentile(update_times, 0.95),
+            "update p99": percentile(update_times, 0.99),
+            "draw p50": percentile(draw_times, 0.5),
+            "draw p95": percentile(draw_times, 0.95),
+        }
+        for name, count in counts.items():
+            metrics["count " + name] = count
+        self.samples.append(metrics)
+
+        print(f"night {len(self.samples):4d}: rss {metrics['rss'] / 1024 / 1024:.1f} MB, "
+              f"objects {sum(counts.values()) - counts['Surface'] - counts['Sound']}, "
+              f"surfaces {counts['Surface']}, sounds {counts['Sound']}, zombies {counts['Zombie']}, "
+              f"update ms p50 {metrics['update p50'] * 1000:.2f} p95 {metrics['update p95'] * 1000:.2f} "
+              f"p99 {metrics['update p99'] * 1000:.2f}, draw ms p50 {metrics['draw p50'] * 1000:.2f} "
+              f"p95 {metrics['draw p95'] * 1000:.2f}")
+
+    def find_trends(self):
+        """Get (metric, early value, late value) for every metric that rose past the threshold"""
+        samples = self.samples[SOAK_WARMUP_NIGHTS:]
+        if len(samples) < 4:
+            return []
+
+        # Compare the medians of the first and last quarter of the nights so one slow night isn't a trend
+        window = len(samples) // 4
+        trends = []
+        for name in set().union(*samples):
+            early = percentile(sorted(sample.get(name, 0) for sample in samples[:window]), 0.5)
+            late = percentile(sorted(sample.get(name, 0) for sample in samples[-window:]), 0.5)
+            if name == "rss":
+                floor = RSS_FLOOR
+            elif name.startswith(("update", "draw")):
+                floor = FRAME_TIME_FLOOR
+            else:
+                floor = COUNT_FLOOR
+            if late - early > floor and late > early * (1 + self.threshold):
+                trends.append((name, early, late))
+        return sorted(trends)
+
+    def report(self):
+        """Print any upward trends and return True if there were none"""
+        trends = self.find_trends()
+        if not trends:
+            print("Soak test passed: no metric trended upward")
+            return True
+
+        print(f"Soak test FAILED: {len(trends)} metrics rose more than {self.threshold:.0%}")
+        for name, early, late in trends:
+            print(f"  {name:<32}{early:14.6g} -> {late:14.6g}")
+        return False
@@ -0,0 +1,531 @@
+"""The sprites that make up a level: tiles, the player, bullets, zombies, rubies and portals"""
+import random
+
+import pygame
+
+from zombie_knight import settings, telemetry
+from zombie_knight.collision import get_hitbox_insets
+from zombie_knight.ecs import (Animation, Chaser, Collider, Entity, Gravity, PortalTraveller, Projectile, Sleeper,
+                               Transform, Velocity)
+from zombie_knight.engine import load_frame, load_sound
+from zombie_knight.settings import SLEEP_REST_FRAMES, TILE_SIZE
+
+
+def get_portal_exit(x, y):
+    """Get where a portal sends a player or zombie whose bottomleft is at (x, y)"""
+    #Left and right
+    if x > settings.WORLD_WIDTH // 2:
+        x = 86
+    else:
+        x = settings.WORLD_WIDTH - 150
+    #Top and bottom
+    if y > settings.WORLD_HEIGHT // 2:
+        y = 64
+    else:
+        y = settings.WORLD_HEIGHT - 132
+    return x, y
+
+
+def get_ruby_portal_exit(x, y):
+    """Get a random spot near the opposite corner of the world for a ruby whose bottomleft is at (x, y)"""
+    if x > settings.WORLD_WIDTH // 2:
+        x = random.randint(60, 100)
+    else:
+        x = random.randint(settings.WORLD_WIDTH - 150, settings.WORLD_WIDTH - 100)
+    if y > settings.WORLD_HEIGHT // 2:
+        y = random.randint(64, 100)
+    else:
+        y = random.randint(settings.WORLD_HEIGHT - 132, settings.WORLD_HEIGHT - 100)
+    return x, y
+
+
+def get_tile_image(image_int):
+    """Get the scaled image of a tile type (shared by every tile of the type and every chunk that pre-renders it)"""
+    return load_frame(f"images/tiles/Tile ({image_int}).png", (TILE_SIZE, TILE_SIZE))
+
+
+class Tile(pygame.sprite.Sprite):
+    """A class to represent a 32x32 pixel area in our display"""
+
+    def __init__(self, x, y, image_int, main_group, sub_group=""):
+        """Initialize the tile"""
+        super().__init__()
+
+        self.image = get_tile_image(image_int)
+
+        # Add to platform sub_group if it's a platform tile
+        if image_int in (2, 3, 4, 5):
+            sub_group.add(self)
+
+        # Add every tile to the main group
+        main_group.add(self)
+
+        # Get the rect of the image and position within the grid
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (x, y)
+
+
+class Player(Entity):
+    """A class the user can control"""
+
+    def __init__(self, x, y, platform_group, bullet_group):
+        """Initialize the player"""
+        super().__init__()
+
+        # Set constant variables
+        self.HORIZONTAL_ACCELERATION = 2
+        self.HORIZONTAL_FRICTION = 0.15
+        self.VERTICAL_ACCELERATION = 0.8
+        self.VERTICAL_JUMP_SPEED = 18
+        self.STARTING_HEALTH = 100
+
+        # Animation frames
+        self.move_right_sprites = []
+        self.move_left_sprites = []
+        self.idle_right_sprites = []
+        self.idle_left_sprites = []
+        self.jump_right_sprites = []
+        self.jump_left_sprites = []
+        self.attack_right_sprites = []
+        self.attack_left_sprites = []
+
+        # Moving
+        for i in range(1, 11):
+            self.move_right_sprites.append(load_frame(f"images/player/run/Run ({i}).png", (64, 64)))
+            self.move_left_sprites.append(load_frame(f"images/player/run/Run ({i}).png", (64, 64), True))
+
+        # Idling
+        for i in range(1, 11):
+            self.idle_right_sprites.append(load_frame(f"images/player/idle/Idle ({i}).png", (64, 64)))
+            self.idle_left_sprites.append(load_frame(f"images/player/idle/Idle ({i}).png", (64, 64), True))
+
+        # Jumping
+        for i in range(1, 11):
+            self.jump_right_sprites.append(load_frame(f"images/player/jump/Jump ({i}).png", (64, 64)))
+            self.jump_left_sprites.append(load_frame(f"images/player/jump/Jump ({i}).png", (64, 64), True))
+
+        # Attacking
+        for i in range(1, 11):
+            self.attack_right_sprites.append(load_frame(f"images/player/attack/Attack ({i}).png", (64, 64)))
+            self.attack_left_sprites.append(load_frame(f"images/player/attack/Attack ({i}).png", (64, 64), True))
+
+        # Load image and get rect
+        self.image = self.idle_right_sprites[0]
+        self.rect = self.image.get_rect()
+        self.rect.bottomleft = (x, y)
+
+        # Attach sprite groups
+        self.platform_group = platform_group
+        self.bullet_group = bullet_group
+
+        # Animation booleans
+        self.animate_jump = False
+        self.animate_fire = False
+
+        # Load sounds
+        self.jump_sound = load_sound("sounds/jump_sound.wav")
+        self.slash_sound = load_sound("sounds/slash_sound.wav")
+        self.portal_sound = load_sound("sounds/portal_sound.wav")
+        self.hit_sound = load_sound("sounds/player_hit.wav")
+
+        # Components (the player's own code only turns keys into acceleration and picks animations)
+        self.add_component("transform", Transform(self.rect))
+        self.add_component("velocity", Velocity(0, 0))
+        self.add_component("gravity", Gravity(0, self.VERTICAL_ACCELERATION))
+        self.add_component("animation", Animation(self.idle_right_sprites, 0.5, on_end=self.finish_action))
+        self.add_component("collider", Collider(5, hits_ceiling=True))
+        self.add_component("traveller", PortalTraveller(get_portal_exit, self.portal_sound, telemetry.PLAYER_TRAVELLER))
+
+        # Keys held by a remote client (None reads the keyboard)
+        self.input_keys = None
+
+        # Transparent columns on each side of the knight, trimmed off the box that lands on platforms
+        self.update_hitbox_insets()
+
+        # Set initial player values
+        self.health = self.STARTING_HEALTH
+        self.starting_x = x
+        self.starting_y = y
+
+    def update_hitbox_insets(self):
+        """Measure the transparent columns on each side of the knight's frames"""
+        insets = get_hitbox_insets(self.idle_right_sprites + self.idle_left_sprites + self.move_right_sprites +
+                                   self.move_left_sprites + self.jump_right_sprites + self.jump_left_sprites +
+                                   self.attack_right_sprites + self.attack_left_sprites)
+        self.components["collider"].insets = insets
+
+    def control(self):
+        """Turn the held keys into acceleration and pick the animation for this frame"""
+        keys = self.input_keys if self.input_keys is not None else pygame.key.get_pressed()
+        acceleration = self.acceleration
+        velocity = self.velocity
+
+        if keys[pygame.K_LEFT]:
+            acceleration.x = -self.HORIZONTAL_ACCELERATION
+            sprite_list, speed = self.move_left_sprites, 0.5
+        elif keys[pygame.K_RIGHT]:
+            acceleration.x = self.HORIZONTAL_ACCELERATION
+            sprite_list, speed = self.move_right_sprites, 0.5
+        else:
+            acceleration.x = 0
+            if velocity.x > 0:
+                sprite_list, speed = self.idle_right_sprites, 0.5
+            else:
+                sprite_list, speed = self.idle_left_sprites, 0.5
+        acceleration.x -= velocity.x * self.HORIZONTAL_FRICTION
+
+        # Attacks and jumps play over moving (at the speed moving and the action used to add up to)
+        if self.animate_fire:
+            sprite_list, speed = (self.attack_right_sprites if velocity.x > 0 else self.attack_left_sprites), 0.75
+        elif self.animate_jump:
+            sprite_list, speed = (self.jump_right_sprites if velocity.x > 0 else self.jump_left_sprites), 0.6
+
+        animation = self.components["animation"]
+        animation.frames = sprite_list
+        animation.speed = speed
+
+    def finish_action(self):
+        """Start the animations over and end any jump or attack animation"""
+        self.components["animation"].frame = 0
+        self.animate_jump = False
+        self.animate_fire = False
+
+    def jump(self):
+        """Jump upwards if on a platform, return True if the jump happened"""
+        if pygame.sprite.spritecollide(self, self.platform_group, False):
+            self.jump_sound.play()
+            self.velocity.y = -self.VERTICAL_JUMP_SPEED
+            self.animate_jump = True
+            return True
+        return False
+
+    def fire(self):
+        """Fire a 'bullet' from a sword"""
+        self.slash_sound.play()
+        Bullet(self.rect.centerx, self.rect.centery, self.bullet_group, self)
+        self.animate_fire = True
+
+    def reset(self):
+        """Reset the player's position"""
+        self.velocity = (0, 0)
+        self.position = (self.starting_x, self.starting_y)
+        self.rect.bottomleft = self.position
+
+
+class Bullet(Entity):
+    """A projectile launched by the player"""
+
+    def __init__(self, x, y, bullet_group, player):
+        """Initialize the bullet"""
+        super().__init__()
+
+        # Set constant variables
+        self.VELOCITY = 20
+        self.RANGE = 500
+
+        # Load image and get rect
+        if player.velocity.x > 0:
+            self.image = load_frame("images/player/slash.png", (32, 32))
+        else:
+            self.image = load_frame("images/player/slash.png", (32, 32), True)
+            self.VELOCITY = -self.VELOCITY
+
+        self.rect = self.image.get_rect()
+        self.rect.center = (x, y)
+
+        # The area covered this frame, so a fast bullet can't pass through a zombie
+        self.swept_rect = self.rect.copy()
+
+        # Components (bullets fly straight and don't wrap around)
+        self.add_component("transform", Transform(self.rect, wraps=False))
+        self.add_component("velocity", Velocity(self.VELOCITY, 0))
+        self.add_component("projectile", Projectile(x, self.RANGE))
+
+        bullet_group.add(self)
+
+
+class Zombie(Entity):
+    """An enemy class that moves across the screen"""
+
+    def __init__(self, min_speed, max_speed, gender=None):
+        """Initialize the zombie"""
+        super().__init__()
+
+        # Set constant variables
+        self.VERTICAL_ACCELERATION = 3  # Gravity
+        self.RISE_TIME = 2
+
+        # Animation frames
+        self.walk_right_sprites = []
+        self.walk_left_sprites = []
+        self.die_right_sprites = []
+        self.die_left_sprites = []
+        self.rise_right_sprites = []
+        self.rise_left_sprites = []
+
+        if gender is None:
+            gender = random.randint(0, 1)
+        self.gender = gender
+        if gender == 0:
+            # Walking
+            for i in range(1, 11):
+                self.walk_right_sprites.append(load_frame(f"images/zombie/boy/walk/Walk ({i}).png", (64, 64)))
+                self.walk_left_sprites.append(load_frame(f"images/zombie/boy/walk/Walk ({i}).png", (64, 64), True))
+
+            # Dying
+            for i in range(1, 11):
+                self.die_right_sprites.append(load_frame(f"images/zombie/boy/dead/Dead ({i}).png", (64, 64)))
+                self.die_left_sprites.append(load_frame(f"images/zombie/boy/dead/Dead ({i}).png", (64, 64), True))
+
+            # Rising
+            for i in range(10, 0, -1):
+                self.rise_right_sprites.append(load_frame(f"images/zombie/boy/dead/Dead ({i}).png", (64, 64)))
+                self.rise_left_sprites.append(load_frame(f"images/zombie/boy/dead/Dead ({i}).png", (64, 64), True))
+
+        else:
+            # Walking
+            for i in range(1, 11):
+                self.walk_right_sprites.append(load_frame(f"images/zombie/girl/walk/Walk ({i}).png", (64, 64)))
+                self.walk_left_sprites.append(load_frame(f"images/zombie/girl/walk/Walk ({i}).png", (64, 64), True))
+
+            # Dying
+            for i in range(1, 11):
+                self.die_right_sprites.append(load_frame(f"images/zombie/girl/dead/Dead ({i}).png", (64, 64)))
+                self.die_left_sprites.append(load_frame(f"images/zombie/girl/dead/Dead ({i}).png", (64, 64), True))
+
+            # Rising
+            for i in range(10, 0, -1):
+                self.rise_right_sprites.append(load_frame(f"images/zombie/girl/dead/Dead ({i}).png", (64, 64)))
+                self.rise_left_sprites.append(load_frame(f"images/zombie/girl/dead/Dead ({i}).png", (64, 64), True))
+
+        # Load an image and get rect
+        direction = random.choice([-1, 1])
+        if direction == -1:
+            walk_sprites = self.walk_left_sprites
+        else:
+            walk_sprites = self.walk_right_sprites
+        self.image = walk_sprites[0]
+
+        self.rect = self.image.get_rect()
+        #Drop in anywhere across the top of the world (100 to 800 on a one screen map)
+        self.rect.bottomleft = (random.randint(100, max(settings.WORLD_WIDTH - 480, 100)), -100)
+
+        # Animation booleans
+        self.animate_death = False
+        self.animate_rise = False
+
+        # Load sounds
+        self.hit_sound = load_sound("sounds/zombie_hit.wav")
+        self.kick_sound = load_sound("sounds/zombie_kick.wav")
+        self.portal_sound = load_sound("sounds/portal_sound.wav")
+
+        # Components (walking toward the player along the level's flow field)
+        self.add_component("transform", Transform(self.rect))
+        self.add_component("velocity", Velocity(direction * random.randint(min_speed, max_speed), 0))
+        self.add_component("gravity", Gravity(0, self.VERTICAL_ACCELERATION))
+        self.add_component("animation", Animation(walk_sprites, .5))
+        self.add_component("collider", Collider(1))
+        self.add_component("traveller", PortalTraveller(get_portal_exit, self.portal_sound, telemetry.ZOMBIE_TRAVELLER))
+        self.add_component("chaser", Chaser(direction, self.walk_left_sprites, self.walk_right_sprites))
+        self.add_component("sleeper", Sleeper(SLEEP_REST_FRAMES))
+
+        # Initial zombie values (a dead zombie's rise waits in the game's scheduler)
+        self.is_dead = False
+        self.rise_timer = None
+        self.walk_speed = abs(self.velocity.x)
+
+
+    @property
+    def direction(self):
+        """Get the way the zombie is walking (-1 left, 1 right)"""
+        return self.components["chaser"].direction
+
+
+    def die(self):
+        """Stop walking and fall down, the sleeper puts it to sleep once it lies still on a platform"""
+        if not self.is_dead:
+            self.walk_speed = abs(self.velocity.x)
+        self.is_dead = True
+        self.animate_death = True
+        self.velocity.x = 0
+        self.disable_component("chaser")
+
+        animation = self.components["animation"]
+        animation.frames = self.die_right_sprites if self.direction == 1 else self.die_left_sprites
+        animation.speed = .095
+        animation.on_end = self.finish_dying
+        self.enable_component("animation")
+
+
+    def finish_dying(self):
+        """Stop animating on the last death frame (a zombie shot while rising goes on rising)"""
+        self.animate_death = False
+        self.disable_component("animation")
+        if self.animate_rise:
+            self.rise()
+
+
+    def rise(self):
+        """Start rising from the dead (called by the scheduler RISE_TIME seconds after death)"""
+        self.rise_timer = None
+        self.animate_rise = True
+        #When the zombie died, the image was kept as the last image
+        #When it rises, we want to start at index 0 of our rise_sprite lists
+        animation = self.components["animation"]
+        animation.play(self.rise_right_sprites if self.direction == 1 else self.rise_left_sprites, .095, self.finish_rising)
+        self.enable_component("animation")
+
+
+    def finish_rising(self):
+        """Walk again once the rise animation is over"""
+        self.animate_rise = False
+        self.is_dead = False
+        self.components["animation"].play(self.components["chaser"].walk_frames[self.direction], .5)
+        self.velocity.x = self.direction * self.walk_speed
+        self.enable_component("chaser")
+        self.wake()
+
+
+class RubyMaker(Entity):
+    """A tile that is animated.  A ruby will be generated here."""
+
+    def __init__(self, x, y, main_group):
+        """Initialize the ruby maker"""
+        super().__init__()
+
+        # Animation frames
+        self.ruby_sprites = []
+
+        # Load ruby sprite images
+        self.ruby_sprites.append(load_frame("images/ruby/tile000.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile001.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile002.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile003.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile004.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile005.png", (64, 64)))
+        self.ruby_sprites.append(load_frame("images/ruby/tile006.png", (64, 64)))
+
+        # Load image and get rect
+        self.image = self.ruby_sprites[0]
+        self.rect = self.image.get_rect()
+        self.rect.bottomleft = (x, y)
+
+        # Components (it only animates)
+        self.add_component("transform", Transform(self.rect, wraps=False))
+        self.add_component("animation", Animation(self.ruby_sprites, 0.25))
+
+        # Add to the main group for drawing purposes
+        main_group.add(self)
+
+
+class Ruby(Entity):
+    """A class the player must collect to earn points and health"""
+
+    def __init__(self):
+        """Initialize the ruby"""
+        super().__init__()
+
+        # Set constant variables
+        self.VERTICAL_ACCELERATION = 3  # Gravity
+        self.HORIZONTAL_VELOCITY = 5
+
+        # Animation frames (Pre-load and scale sprites)
+        self.ruby_sprites = [
+            load_frame("images/ruby/tile000.png", (64, 64)),
+            load_frame("images/ruby/tile001.png", (64, 64)),
+            load_frame("images/ruby/tile002.png", (64, 64)),
+            load_frame("images/ruby/tile003.png", (64, 64)),
+            load_frame("images/ruby/tile004.png", (64, 64)),
+            load_frame("images/ruby/tile005.png", (64, 64)),
+            load_frame("images/ruby/tile006.png", (64, 64))
+        ]
+
+        # Load image and get rect
+        self.image = self.ruby_sprites[0]
+        self.rect = self.image.get_rect()
+        self.rect.bottomleft = (settings.WORLD_WIDTH // 2, 100)
+
+        # Load sounds
+        self.portal_sound = load_sound("sounds/portal_sound.wav")
+
+        # Components (the speed is limited to avoid extreme movement)
+        self.add_component("transform", Transform(self.rect))
+        self.add_component("velocity", Velocity(random.choice([-1 * self.HORIZONTAL_VELOCITY, self.HORIZONTAL_VELOCITY]), 0, 10))
+        self.add_component("gravity", Gravity(0, self.VERTICAL_ACCELERATION))
+        self.add_component("animation", Animation(self.ruby_sprites, .25))
+        self.add_component("collider", Collider(1))
+        self.add_component("traveller", PortalTraveller(get_ruby_portal_exit, self.portal_sound, telemetry.RUBY_TRAVELLER))
+
+
+class Portal(Entity):
+    """A class that if collided with will transport you"""
+
+    def __init__(self, x, y, color, portal_group):
+        """Initialize the portal"""
+        super().__init__()
+
+        # Animation frames
+        self.portal_sprites = []
+
+        # Portal animation
+        if color == "green":
+            # Green portal
+            self.portal_sprites.append(load_frame("images/portals/green/tile000.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile001.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile002.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile003.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile004.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile005.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile006.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile007.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile008.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile009.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile010.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile011.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile012.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile013.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile014.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile015.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile016.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile017.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile018.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile019.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile020.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/green/tile021.png", (72, 72)))
+        else:
+            # Purple portal
+            self.portal_sprites.append(load_frame("images/portals/purple/tile000.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile001.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile002.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile003.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile004.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile005.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile006.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile007.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile008.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile009.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile010.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile011.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile012.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile013.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile014.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile015.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile016.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile017.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile018.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile019.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile020.png", (72, 72)))
+            self.portal_sprites.append(load_frame("images/portals/purple/tile021.png", (72, 72)))
+
+        # Load an image and get a rect
+        current_sprite = random.randint(0, len(self.portal_sprites) - 1)
+        self.image = self.portal_sprites[current_sprite]
+        self.rect = self.image.get_rect()
+        self.rect.bottomleft = (x, y)
+
+        # Components (it only animates)
+        self.add_component("transform", Transform(self.rect, wraps=False))
+        self.add_component("animation", Animation(self.portal_sprites, .2, current_sprite))
+
+        # Add to the portal group
+        portal_group.add(self)
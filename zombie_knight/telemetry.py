@@ -0,0 +1,204 @@
+"""Gameplay telemetry: events are packed into a preallocated buffer and written out in compressed batches by a background thread
+
+Recording an event is a struct.pack_into into memory. When the buffer
+fills (or every TELEMETRY_FLUSH_INTERVAL seconds) its bytes are handed
+to a writer thread that compresses them with zlib and appends them to
+the log, so the game never waits on the disk.
+
+The log starts with MAGIC, then holds batches of a 4 byte length and
+that many bytes of compressed EVENT_RECORDs. Summarize one with
+    python -m zombie_knight.telemetry telemetry.bin
+"""
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+from zombie_knight.settings import FPS, TELEMETRY_BUFFER_EVENTS, TELEMETRY_FLUSH_INTERVAL, TILE_SIZE
+
+MAGIC = b"ZKT1"
+BATCH_HEADER = struct.Struct("<I")
+
+# time in ms, kind, x, y, and three values whose meaning depends on the kind
+EVENT_RECORD = struct.Struct("<IBiiiii")
+
+# Event kinds                 x, y                 values
+ZOMBIE_HIT = 1              # zombie               zombies alive
+ZOMBIE_KILL = 2             # zombie               score
+PLAYER_HIT = 3              # player               health
+RUBY_PICKUP = 4             # player               score, health
+PORTAL = 5                  # traveller            PLAYER_TRAVELLER/ZOMBIE_TRAVELLER/RUBY_TRAVELLER
+NIGHT_SURVIVED = 6          # player               night, score, zombies alive
+GAME_OVER = 7               # player               night, score, zombies alive
+FRAME_TIMES = 8             # -                    p50, p95 and max frame time in microseconds
+
+EVENT_NAMES = {ZOMBIE_HIT: "zombie_hit", ZOMBIE_KILL: "zombie_kill", PLAYER_HIT: "player_hit",
+               RUBY_PICKUP: "ruby_pickup", PORTAL: "portal", NIGHT_SURVIVED: "night_survived",
+               GAME_OVER: "game_over", FRAME_TIMES: "frame_times"}
+
+PLAYER_TRAVELLER = 0
+ZOMBIE_TRAVELLER = 1
+RUBY_TRAVELLER = 2
+
+# The running log, None while telemetry is off
+_telemetry = None
+
+
+class Telemetry():
+    """A class to buffer gameplay events and write them out on a background thread"""
+
+    def __init__(self, path, capacity=TELEMETRY_BUFFER_EVENTS):
+        """Initialize the telemetry log"""
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * EVENT_RECORD.size)
+        self.count = 0
+        self.lock = threading.Lock()
+        self.start_time = time.perf_counter()
+        self.flush_time = self.start_time
+
+        # One frame time per frame for a second, summarized into a FRAME_TIMES event
+        self.frame_times = [0.0] * FPS
+        self.frame_index = 0
+
+        # Batches waiting for the writer, None tells it to stop
+        self.batches = queue.SimpleQueue()
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.writer = threading.Thread(target=self.write_batches, name="telemetry", daemon=True)
+        self.writer.start()
+
+        self.event_count = 0
+        self.bytes_written = 0
+
+    def record(self, kind, x=0, y=0, a=0, b=0, c=0):
+        """Add an event to the buffer"""
+        milliseconds = int((time.perf_counter() - self.start_time) * 1000)
+        with self.lock:
+            EVENT_RECORD.pack_into(self.buffer, self.count * EVENT_RECORD.size, milliseconds, kind,
+                                   int(x), int(y), int(a), int(b), int(c))
+            self.count += 1
+            self.event_count += 1
+            if self.count == self.capacity:
+                self.flush()
+
+    def record_frame_time(self, seconds):
+        """Add a frame time, a summary event is recorded once a second"""
+        self.frame_times[self.frame_index] = seconds
+        self.frame_index += 1
+        if self.frame_index == len(self.frame_times):
+            self.frame_index = 0
+            frame_times = sorted(self.frame_times)
+            self.record(FRAME_TIMES, 0, 0, frame_times[len(frame_times) // 2] * 1000000,
+                        frame_times[int(len(frame_times) * 0.95)] * 1000000, frame_times[-1] * 1000000)
+
+            # A quiet game still reaches the disk every few seconds
+            if time.perf_counter() - self.flush_time >= TELEMETRY_FLUSH_INTERVAL:
+                with self.lock:
+                    self.flush()
+
+    def flush(self):
+        """Hand the buffered events to the writer (the caller holds the lock)"""
+        self.flush_time = time.perf_counter()
+        if self.count:
+            self.batches.put(bytes(self.buffer[:self.count * EVENT_RECORD.size]))
+            self.count = 0
+
+    def write_batches(self):
+        """Compress and write batches until told to stop (runs on the writer thread)"""
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            compressed = zlib.compress(batch)
+            self.file.write(BATCH_HEADER.pack(len(compressed)))
+            self.file.write(compressed)
+            self.bytes_written += BATCH_HEADER.size + len(compressed)
+        self.file.close()
+
+    def close(self):
+        """Write out what is left and wait for the writer to finish"""
+        with self.lock:
+            self.flush()
+        self.batches.put(None)
+        self.writer.join()
+
+
+def start_telemetry(path):
+    """Start logging events to a file"""
+    global _telemetry
+    _telemetry = Telemetry(path)
+    return _telemetry
+
+
+def stop_telemetry():
+    """Finish the log, if one is running"""
+    global _telemetry
+    if _telemetry:
+        _telemetry.close()
+        print(f"Telemetry: {_telemetry.event_count} events, {_telemetry.bytes_written} bytes written")
+        _telemetry = None
+
+
+def record(kind, x=0, y=0, a=0, b=0, c=0):
+    """Log an event (does nothing while telemetry is off)"""
+    if _telemetry:
+        _telemetry.record(kind, x, y, a, b, c)
+
+
+def record_frame_time(seconds):
+    """Log how long a frame took (does nothing while telemetry is off)"""
+    if _telemetry:
+        _telemetry.record_frame_time(seconds)
+
+
+def read_events(path):
+    """Read a log, yielding (milliseconds, kind name, x, y, a, b, c) for each event"""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a telemetry log")
+        while True:
+            header = file.read(BATCH_HEADER.size)
+            if len(header) < BATCH_HEADER.size:
+                return
+            batch = zlib.decompress(file.read(BATCH_HEADER.unpack(header)[0]))
+            for milliseconds, kind, x, y, a, b, c in EVENT_RECORD.iter_unpack(batch):
+                yield milliseconds, EVENT_NAMES.get(kind, str(kind)), x, y, a, b, c
+
+
+def summarize(path):
+    """Print event counts, where the player died and how nights ended"""
+    counts = Counter()
+    deaths = Counter()
+    nights = []
+    frame_p95s = []
+    for milliseconds, name, x, y, a, b, c in read_events(path):
+        counts[name] += 1
+        if name == "game_over":
+            deaths[(x // TILE_SIZE, y // TILE_SIZE)] += 1
+        if name in ("night_survived", "game_over"):
+            nights.append((name, a, b, c))
+        if name == "frame_times":
+            frame_p95s.append(b)
+
+    print("Events:")
+    for name, count in counts.most_common():
+        print(f"  {name:<16}{count:8d}")
+    if deaths:
+        print("Deaths by tile (column, row):")
+        for tile, count in deaths.most_common(10):
+            print(f"  {tile}: {count}")
+    if nights:
+        survived = sum(1 for night in nights if night[0] == "night_survived")
+        print(f"Nights: {survived} survived, {len(nights) - survived} lost, "
+              f"{sum(night[3] for night in nights) / len(nights):.1f} zombies alive at the end on average")
+    if frame_p95s:
+        frame_p95s.sort()
+        print(f"Frame time p95 (per second): median {frame_p95s[len(frame_p95s) // 2] / 1000:.2f} ms, "
+              f"worst {frame_p95s[-1] / 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    summarize(sys.argv[1])
@@ -0,0 +1,227 @@
+"""Run the simulation on a worker thread while the main thread reads input and draws the newest snapshot
+
+Python threads only run at the same time while one of them is inside code
+that lets go of the interpreter lock (presenting the frame, waiting on the
+clock, sleeping), so the overlap between the two threads is measured and
+reported rather than assumed.
+"""
+import threading
+import time
+
+import pygame
+
+from zombie_knight import telemetry
+from zombie_knight.engine import get_display_surface, play_music
+from zombie_knight.inputs import InputHandler
+from zombie_knight.settings import FPS, STATS_INTERVAL
+
+
+def get_overlap(intervals, other_intervals):
+    """Get the total time two sorted lists of (start, end) intervals were both running"""
+    overlap = 0
+    i = j = 0
+    while i < len(intervals) and j < len(other_intervals):
+        start = max(intervals[i][0], other_intervals[j][0])
+        end = min(intervals[i][1], other_intervals[j][1])
+        if end > start:
+            overlap += end - start
+        if intervals[i][1] < other_intervals[j][1]:
+            i += 1
+        else:
+            j += 1
+    return overlap
+
+
+class TripleBuffer():
+    """A class to hand the newest snapshot from a writer thread to a reader thread without either waiting on the other
+
+    The writer fills the back slot and swaps it with the ready slot, the
+    reader swaps the ready slot with the front slot when there is something
+    new. Snapshots that are replaced before the reader gets to them are
+    counted as dropped.
+    """
+
+    def __init__(self):
+        """Initialize the buffer"""
+        self.slots = [None, None, None]
+        self.back = 0
+        self.ready = 1
+        self.front = 2
+        self.is_fresh = False
+        self.lock = threading.Lock()
+
+        self.published_count = 0
+        self.dropped_count = 0
+
+    def publish(self, snapshot):
+        """Make a snapshot the newest one (called by the writer)"""
+        self.slots[self.back] = snapshot
+        with self.lock:
+            if self.is_fresh:
+                self.dropped_count += 1
+            self.back, self.ready = self.ready, self.back
+            self.is_fresh = True
+            self.published_count += 1
+
+    def latest(self):
+        """Get the newest snapshot and whether it wasn't seen before (called by the reader)"""
+        with self.lock:
+            is_new = self.is_fresh
+            if is_new:
+                self.front, self.ready = self.ready, self.front
+                self.is_fresh = False
+        return self.slots[self.front], is_new
+
+
+class ThreadedRunner():
+    """A class that steps the level on a worker thread at a fixed tick while the main thread draws and presents"""
+
+    def __init__(self, level, inputs=None):
+        """Initialize the runner"""
+        self.level = level
+        self.game = level.game
+        self.player = level.player
+        self.clock = pygame.time.Clock()
+
+        self.buffer = TripleBuffer()
+        self.thread = threading.Thread(target=self.simulate, name="simulation", daemon=True)
+        self.is_running = False
+
+        # Keys are read on the main thread, jumps and shots are acted on by the simulation before its next step
+        self.inputs = inputs or InputHandler(self.player)
+
+        # The simulation waits here while the main thread shows the pause screen
+        self.game.wait_for_unpause = self.wait_for_unpause
+        self.pause_text = None
+        self.unpaused = threading.Event()
+
+        # Statistics for the current report
+        self.stats_lock = threading.Lock()
+        self.simulation_intervals = []
+        self.render_intervals = []
+        self.latencies = []
+        self.repeated_frames = 0
+        self.report_time = time.perf_counter()
+        self.reported_published = 0
+        self.reported_dropped = 0
+
+    def run(self):
+        """Start the simulation thread and draw until the window is closed"""
+        # The simulation starts out waiting on the title screen
+        play_music()
+        pygame.mixer.music.pause()
+        self.pause_text = ("Zombie Knight", "Press 'Enter' to Begin")
+
+        self.is_running = True
+        self.thread.start()
+        try:
+            while self.is_running:
+                self.handle_events()
+
+                start = time.perf_counter()
+                snapshot = self.draw()
+                pygame.display.update()
+                end = time.perf_counter()
+
+                # Latency runs from the end of the step that made a snapshot until it is on screen
+                with self.stats_lock:
+                    self.render_intervals.append((start, end))
+                    if snapshot:
+                        self.latencies.append(end - snapshot.time)
+                if snapshot:
+                    self.inputs.presented(snapshot.frame)
+                telemetry.record_frame_time(end - start)
+
+                if end - self.report_time >= STATS_INTERVAL:
+                    self.report()
+                self.clock.tick(FPS)
+        finally:
+            self.is_running = False
+            self.unpaused.set()
+            self.thread.join()
+            self.report()
+
+    def handle_events(self):
+        """Pass key presses to the simulation"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.is_running = False
+            # Player wants to carry on after a pause
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and self.pause_text:
+                self.pause_text = None
+                pygame.mixer.music.unpause()
+                self.unpaused.set()
+            self.inputs.handle_event(event)
+        self.inputs.poll_keys()
+
+    def draw(self):
+        """Draw the pause screen or the newest snapshot, return the snapshot if it hadn't been drawn before"""
+        pause_text = self.pause_text
+        if pause_text:
+            self.game.draw_pause_screen(*pause_text)
+            return None
+
+        snapshot, is_new = self.buffer.latest()
+        if snapshot is None:
+            get_display_surface().fill((0, 0, 0))
+            return None
+
+        self.level.draw_snapshot(snapshot)
+        if not is_new:
+            self.repeated_frames += 1
+            return None
+        return snapshot
+
+    def simulate(self):
+        """Step the level at a fixed tick and publish a snapshot after each step (runs on the worker thread)"""
+        self.unpaused.wait()
+        next_tick = time.perf_counter()
+        while self.is_running:
+            start = time.perf_counter()
+            self.inputs.apply(self.level.frame_count)
+            self.level.update()
+            self.buffer.publish(self.level.capture())
+            end = time.perf_counter()
+            with self.stats_lock:
+                self.simulation_intervals.append((start, end))
+
+            # Sleep until the next tick, skip ahead if we fell far behind (or were paused)
+            next_tick += 1 / FPS
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -1:
+                next_tick = time.perf_counter()
+
+    def wait_for_unpause(self, main_text, sub_text):
+        """Have the main thread show the pause screen and wait until it is dismissed (runs on the worker thread)"""
+        self.unpaused.clear()
+        self.pause_text = (main_text, sub_text)
+        self.unpaused.wait()
+
+    def report(self):
+        """Print step, frame, overlap and snapshot latency statistics since the last report"""
+        now = time.perf_counter()
+        elapsed = now - self.report_time
+        with self.stats_lock:
+            simulation_intervals, self.simulation_intervals = self.simulation_intervals, []
+            render_intervals, self.render_intervals = self.render_intervals, []
+            latencies, self.latencies = sorted(self.latencies), []
+        published = self.buffer.published_count - self.reported_published
+        dropped = self.buffer.dropped_count - self.reported_dropped
+        self.reported_published = self.buffer.published_count
+        self.reported_dropped = self.buffer.dropped_count
+
+        if elapsed > 0 and latencies:
+            simulation_busy = sum(end - start for start, end in simulation_intervals) / elapsed * 100
+            render_busy = sum(end - start for start, end in render_intervals) / elapsed * 100
+            overlap = get_overlap(simulation_intervals, render_intervals) / elapsed * 100
+            p50 = latencies[len(latencies) // 2] * 1000
+            p95 = latencies[int(len(latencies) * 0.95)] * 1000
+            print(f"simulation {len(simulation_intervals) / elapsed:.1f} steps/s busy {simulation_busy:.0f}%, "
+                  f"render {len(render_intervals) / elapsed:.1f} fps busy {render_busy:.0f}%, overlap {overlap:.0f}%, "
+                  f"snapshot latency ms p50 {p50:.2f} p95 {p95:.2f} max {latencies[-1] * 1000:.2f}, "
+                  f"{published} published, {dropped} dropped, {self.repeated_frames} repeated")
+
+        self.repeated_frames = 0
+        self.report_time = now
@@ -0,0 +1,183 @@
+"""Large worlds: a camera that follows the player and chunks built around it as it moves"""
+import pygame
+
+from zombie_knight.ecs import EntityGroup
+from zombie_knight.settings import CHUNK_LOAD_RADIUS, CHUNK_SIZE, TILE_SIZE, WINDOW_HEIGHT, WINDOW_WIDTH
+from zombie_knight.sprites import RubyMaker, Tile, get_tile_image
+
+
+class Camera():
+    """A class to follow the player around a world that can be larger than the window"""
+
+    def __init__(self, world_width, world_height):
+        """Initialize the camera"""
+        self.world_width = world_width
+        self.world_height = world_height
+
+        # The part of the world currently shown in the window
+        self.view_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    def follow(self, target_rect):
+        """Center the view on a target, but never show past the edge of the world"""
+        self.view_rect.center = target_rect.center
+        self.view_rect.clamp_ip(pygame.Rect(0, 0, max(self.world_width, WINDOW_WIDTH), max(self.world_height, WINDOW_HEIGHT)))
+
+    def apply(self, rect):
+        """Return the screen position of a rect in world coordinates"""
+        return rect.move(-self.view_rect.x, -self.view_rect.y)
+
+    def get_blits(self, group):
+        """Get (image, screen position) pairs for the sprites of a group that can be seen"""
+        view_rect = self.view_rect
+        return [(sprite.image, (sprite.rect.x - view_rect.x, sprite.rect.y - view_rect.y))
+                for sprite in group if view_rect.colliderect(sprite.rect)]
+
+
+class Chunk():
+    """A CHUNK_SIZE x CHUNK_SIZE block of tiles pre-rendered into a single surface"""
+
+    def __init__(self, chunk_x, chunk_y, tile_rows, platform_group, systems=None):
+        """Initialize the chunk"""
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+
+        # World position and size of the chunk
+        left = chunk_x * CHUNK_SIZE * TILE_SIZE
+        top = chunk_y * CHUNK_SIZE * TILE_SIZE
+        self.rect = pygame.Rect(left, top, CHUNK_SIZE * TILE_SIZE, CHUNK_SIZE * TILE_SIZE)
+
+        # Static tiles are drawn once into the chunk surface
+        self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+
+        # Platform tiles still need sprites for collisions, ruby makers are animated by the systems
+        self.tile_group = pygame.sprite.Group()
+        self.animated_group = EntityGroup(systems)
+
+        # Tile types in the chunk, so a changed tile image only redraws the chunks that use it
+        self.tile_ids = {tile_id for row in tile_rows for tile_id in row}
+
+        for i in range(len(tile_rows)):
+            for j in range(len(tile_rows[i])):
+                x = left + j * TILE_SIZE
+                y = top + i * TILE_SIZE
+                #Dirt tiles
+                if tile_rows[i][j] == 1:
+                    self.image.blit(get_tile_image(1), (j * TILE_SIZE, i * TILE_SIZE))
+                #Platform tiles
+                elif tile_rows[i][j] in (2, 3, 4, 5):
+                    self.image.blit(get_tile_image(tile_rows[i][j]), (j * TILE_SIZE, i * TILE_SIZE))
+                    Tile(x, y, tile_rows[i][j], self.tile_group, platform_group)
+                #Ruby Maker
+                elif tile_rows[i][j] == 6:
+                    RubyMaker(x, y, self.animated_group)
+
+        if pygame.display.get_surface():
+            self.image = self.image.convert_alpha()
+
+    def unload(self):
+        """Remove the chunk's sprites from every group they belong to"""
+        for sprite in self.tile_group.sprites() + self.animated_group.sprites():
+            sprite.kill()
+
+
+class World():
+    """A class to build the chunks of a large tile map around the camera and drop the ones it leaves"""
+
+    def __init__(self, tile_map, platform_group, systems=None):
+        """Initialize the world"""
+        self.platform_group = platform_group
+        self.systems = systems
+        self.tile_map = tile_map
+
+        # World size in tiles, pixels and chunks
+        self.rows = len(tile_map)
+        self.cols = len(tile_map[0])
+        self.width = self.cols * TILE_SIZE
+        self.height = self.rows * TILE_SIZE
+        self.chunk_cols = (self.cols + CHUNK_SIZE - 1) // CHUNK_SIZE
+        self.chunk_rows = (self.rows + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+        # Loaded chunks by (chunk_x, chunk_y) and the world area they cover
+        self.chunks = {}
+        self.active_rect = pygame.Rect(0, 0, 0, 0)
+
+    def set_tile_map(self, tile_map):
+        """Swap in an edited tile map of the same size, return the chunks that differ from the old one"""
+        changed = []
+        for chunk_y in range(self.chunk_rows):
+            for chunk_x in range(self.chunk_cols):
+                if self.get_chunk_rows(tile_map, chunk_x, chunk_y) != self.get_chunk_rows(self.tile_map, chunk_x, chunk_y):
+                    changed.append((chunk_x, chunk_y))
+        self.tile_map = tile_map
+        return changed
+
+    def get_chunk_rows(self, tile_map, chunk_x, chunk_y):
+        """Get the rows of a tile map that fall inside a chunk"""
+        return [row[chunk_x * CHUNK_SIZE:(chunk_x + 1) * CHUNK_SIZE]
+                for row in tile_map[chunk_y * CHUNK_SIZE:(chunk_y + 1) * CHUNK_SIZE]]
+
+    def load_chunk(self, chunk_x, chunk_y):
+        """Build a chunk from its rows of the tile map"""
+        tile_rows = self.get_chunk_rows(self.tile_map, chunk_x, chunk_y)
+        self.chunks[(chunk_x, chunk_y)] = Chunk(chunk_x, chunk_y, tile_rows, self.platform_group, self.systems)
+
+    def unload_chunk(self, chunk_x, chunk_y):
+        """Drop a chunk that is far from the camera"""
+        self.chunks.pop((chunk_x, chunk_y)).unload()
+
+    def rebuild_chunks(self, keys=None, tile_ids=None):
+        """Build loaded chunks again: the given ones, the ones using any of tile_ids, or all of them"""
+        rebuilt = 0
+        for key, chunk in list(self.chunks.items()):
+            if (keys is None or key in keys) and (tile_ids is None or chunk.tile_ids & tile_ids):
+                self.unload_chunk(*key)
+                self.load_chunk(*key)
+                rebuilt += 1
+                #Anything sleeping on the old platforms has to check where it stands again
+                if self.systems:
+                    self.systems.wake_touching(chunk.rect)
+        return rebuilt
+
+    def chunk_range(self, rect, radius=0):
+        """Get the (first, last) chunk columns and rows that a rect touches"""
+        chunk_pixels = CHUNK_SIZE * TILE_SIZE
+        first_x = max(rect.left // chunk_pixels - radius, 0)
+        first_y = max(rect.top // chunk_pixels - radius, 0)
+        last_x = min((rect.right - 1) // chunk_pixels + radius, self.chunk_cols - 1)
+        last_y = min((rect.bottom - 1) // chunk_pixels + radius, self.chunk_rows - 1)
+        return first_x, first_y, last_x, last_y
+
+    def update(self, camera):
+        """Load the chunks around the camera and unload the rest"""
+        first_x, first_y, last_x, last_y = self.chunk_range(camera.view_rect, CHUNK_LOAD_RADIUS)
+        wanted = {(x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)}
+
+        for key in list(self.chunks):
+            if key not in wanted:
+                self.unload_chunk(*key)
+        for key in wanted:
+            if key not in self.chunks:
+                self.load_chunk(*key)
+
+        chunk_pixels = CHUNK_SIZE * TILE_SIZE
+        self.active_rect = pygame.Rect(first_x * chunk_pixels, first_y * chunk_pixels,
+                                       (last_x - first_x + 1) * chunk_pixels, (last_y - first_y + 1) * chunk_pixels)
+
+        # Zombies drop in from above the top of the world, keep that area active too
+        if first_y == 0:
+            self.active_rect.top -= chunk_pixels
+            self.active_rect.height += chunk_pixels
+
+    def visible_chunks(self, camera):
+        """Get the loaded chunks inside the camera view"""
+        first_x, first_y, last_x, last_y = self.chunk_range(camera.view_rect)
+        return [self.chunks[(x, y)] for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)
+                if (x, y) in self.chunks]
+
+    def get_blits(self, camera):
+        """Get (image, screen position) pairs for the visible chunks and their animated tiles"""
+        blits = []
+        for chunk in self.visible_chunks(camera):
+            blits.append((chunk.image, camera.apply(chunk.rect).topleft))
+            blits.extend(camera.get_blits(chunk.animated_group))
+        return blits